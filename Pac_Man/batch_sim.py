@@ -0,0 +1,677 @@
+"""
+Vectorised batch simulator for Valentine's Pac-Man game.
+Steps many independent games at once, keeping their state as NumPy
+struct-of-arrays buffers instead of PacMan/Ghost/Heart objects.
+Movement, ghost targeting, dot eating, roses and hearts follow the same
+rules as Game.update, tick for tick (see verify_parity).
+
+Usage:
+    python batch_sim.py [--games N] [--ticks T] [--parity]
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from config import (
+    TILE_SIZE, SUBPIXEL, TICK_RATE, TICK_MS,
+    PACMAN_SPEED, GHOST_SPEED, HEART_SPEED, POWERUP_DURATION,
+    HEART_FIRE_RATE, MAX_HEARTS, ROSE_SPAWN_INTERVAL, GHOST_RESPAWN_TIME,
+    DOT_SCORE, GHOST_SCORE, ROSE_SCORE, STARTING_LIVES,
+    STATE_PLAYING, STATE_GAME_OVER, STATE_WIN,
+    UP, DOWN, LEFT, RIGHT, NONE
+)
+from maze import Maze, UNREACHABLE
+from subpixel import TILE, HALF_TILE, ORIGIN_X, ORIGIN_Y, to_subpixels
+
+# Direction indices used in the arrays (order matters: ghosts try
+# directions in this order, exactly like Ghost._get_valid_directions)
+DIRECTIONS = [UP, DOWN, LEFT, RIGHT, NONE]
+DIR_UP, DIR_DOWN, DIR_LEFT, DIR_RIGHT, DIR_NONE = range(5)
+DX = np.array([d[0] for d in DIRECTIONS])
+DY = np.array([d[1] for d in DIRECTIONS])
+OPPOSITE = np.array([DIR_DOWN, DIR_UP, DIR_RIGHT, DIR_LEFT, DIR_NONE])
+
+# Game state codes
+STATES = [STATE_PLAYING, STATE_GAME_OVER, STATE_WIN]
+PLAYING, GAME_OVER, WIN = range(3)
+
+BLINKY, PINKY, INKY, CLYDE = range(4)
+NUM_GHOSTS = 4
+
+RADIUS = TILE_SIZE // 2 - 2  # Pac-Man, ghost and rose radius
+HEART_HALF = 4  # Half of a heart's collision box
+DEATH_DURATION = 1500
+
+# Positions are in sub-pixel steps, like PacMan.sub_x and co
+PACMAN_STEP = to_subpixels(PACMAN_SPEED)
+GHOST_STEP = to_subpixels(GHOST_SPEED)
+HEART_STEP = to_subpixels(HEART_SPEED)
+
+# Ghost steering cost of a step with no path to the target: ranked after any
+# real distance but before directions that are not valid at all
+UNREACHABLE_COST = 1e9
+
+
+class BatchSim:
+    """N independent games stepped together as NumPy arrays."""
+    
+    def __init__(self, seeds, maze=None):
+        """
+        Create one game per seed, ready to play.
+        
+        Each game draws ghost exit timers and rose positions from its own
+        random.Random(seed), in the same order as a Game(None) started
+        with reset_game(seed).
+        """
+        maze = maze if maze is not None else Maze()
+        self.n = len(seeds)
+        self.width = maze.width
+        self.height = maze.height
+        self.rngs = [random.Random(seed) for seed in seeds]
+        
+        # Static layout padded with a ring of walls, so any off-maze lookup
+        # (clipped to the ring) reads as a wall
+        cells = np.frombuffer(maze.cells, dtype=np.int8).reshape(
+            self.height, self.width)
+        self._cells = np.pad(cells, 1, constant_values=1)
+        self._tunnel_rows = np.pad(
+            np.isin(np.arange(self.height), list(maze.tunnel_rows)), 1)
+        
+        # Path distances between tiles, as Maze.distance looks them up
+        index, nearest, table, count = maze.get_distance_table()
+        self._path_index = np.array(index, dtype=np.int64)
+        self._nearest_path = np.array(nearest, dtype=np.int64)
+        self._distances = np.array(table, dtype=np.float64).reshape(
+            count, count)
+        self._distances[self._distances == UNREACHABLE] = UNREACHABLE_COST
+        self._dot_bits = np.frombuffer(maze.dots, dtype=np.uint8)  # Same bits
+        
+        self._pacman_start = maze.get_pacman_start()
+        self._ghost_starts = maze.get_ghost_start_positions()
+        self._ghost_exit = maze.get_ghost_house_exit()
+        self._ghost_respawn = maze.get_ghost_respawn()
+        self._ghost_starts_in_house = [
+            maze.is_ghost_house(x, y) for x, y in self._ghost_starts]
+        self._rose_positions = maze.spawn_positions
+        
+        n = self.n
+        self.state = np.full(n, PLAYING, dtype=np.int8)
+        self.tick = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.lives = np.full(n, STARTING_LIVES, dtype=np.int64)
+        self.dots = np.tile(self._dot_bits, (n, 1))
+        self.dots_remaining = np.full(n, maze.dots_remaining, dtype=np.int64)
+        self.death_animation = np.zeros(n, dtype=bool)
+        self.death_time = np.zeros(n, dtype=np.int64)
+        
+        # Pac-Man
+        self.pac_x = np.zeros(n, dtype=np.int64)
+        self.pac_y = np.zeros(n, dtype=np.int64)
+        self.pac_dir = np.zeros(n, dtype=np.int64)
+        self.pac_next = np.zeros(n, dtype=np.int64)
+        self.pac_facing = np.zeros(n, dtype=np.int64)
+        self.powered_up = np.zeros(n, dtype=bool)
+        self.powerup_start = np.zeros(n, dtype=np.int64)
+        
+        # Ghosts: one column per ghost, Blinky/Pinky/Inky/Clyde
+        shape = (n, NUM_GHOSTS)
+        self.ghost_x = np.zeros(shape, dtype=np.int64)
+        self.ghost_y = np.zeros(shape, dtype=np.int64)
+        self.ghost_dir = np.zeros(shape, dtype=np.int64)
+        self.ghost_alive = np.zeros(shape, dtype=bool)
+        self.respawn_time = np.zeros(shape, dtype=np.int64)
+        self.in_ghost_house = np.zeros(shape, dtype=bool)
+        self.exit_timer = np.zeros(shape)
+        self.last_grid_x = np.zeros(shape, dtype=np.int64)
+        self.last_grid_y = np.zeros(shape, dtype=np.int64)
+        self.made_decision = np.zeros(shape, dtype=bool)
+        
+        # Hearts, kept in firing order with the active ones first
+        shape = (n, MAX_HEARTS)
+        self.heart_x = np.zeros(shape, dtype=np.int64)
+        self.heart_y = np.zeros(shape, dtype=np.int64)
+        self.heart_dir = np.zeros(shape, dtype=np.int64)
+        self.heart_active = np.zeros(shape, dtype=bool)
+        self.last_fire_time = np.zeros(n, dtype=np.int64)
+        
+        # Rose
+        self.rose_active = np.zeros(n, dtype=bool)
+        self.rose_x = np.zeros(n, dtype=np.int64)
+        self.rose_y = np.zeros(n, dtype=np.int64)
+        self.rose_last_spawn = np.zeros(n, dtype=np.int64)
+        
+        # reset_game(seed) reseeds the game's generator, then resets the level
+        self._reset_level(np.arange(n))
+    
+    def get_states(self):
+        """Get each game's state as the STATE_* string Game uses."""
+        return [STATES[code] for code in self.state]
+    
+    # ----- Layout lookups (all vectorised) -----
+    
+    def _wrap(self, grid_x, grid_y):
+        """Wrap grid x positions round through the tunnel rows."""
+        tunnel = self._tunnel_rows[np.clip(grid_y, -1, self.height) + 1]
+        return np.where(tunnel, grid_x % self.width, grid_x)
+    
+    def _cell(self, grid_x, grid_y):
+        """Get cell values, treating anything off the maze as wall."""
+        grid_x = np.clip(self._wrap(grid_x, grid_y), -1, self.width) + 1
+        grid_y = np.clip(grid_y, -1, self.height) + 1
+        return self._cells[grid_y, grid_x]
+    
+    def _grid(self, x, y):
+        """Convert sub-pixel positions to grid positions."""
+        return (np.floor_divide(x - ORIGIN_X, TILE),
+                np.floor_divide(y - ORIGIN_Y, TILE))
+    
+    def _tile_center(self, grid_x, grid_y):
+        """Get the centre of tiles, in sub-pixel steps."""
+        return (ORIGIN_X + grid_x * TILE + HALF_TILE,
+                ORIGIN_Y + grid_y * TILE + HALF_TILE)
+    
+    # ----- Resets -----
+    
+    def _reset_ghosts(self, games):
+        """Ghost.reset for every ghost of the given games."""
+        for j, (start_x, start_y) in enumerate(self._ghost_starts):
+            x, y = self._tile_center(start_x, start_y)
+            self.ghost_x[games, j] = x
+            self.ghost_y[games, j] = y
+            self.ghost_dir[games, j] = DIR_LEFT
+            self.ghost_alive[games, j] = True
+            self.respawn_time[games, j] = 0
+            self.in_ghost_house[games, j] = self._ghost_starts_in_house[j]
+            self.last_grid_x[games, j] = start_x
+            self.last_grid_y[games, j] = start_y
+            self.made_decision[games, j] = False
+        for g in games:
+            rng = self.rngs[g]
+            for j in range(NUM_GHOSTS):
+                self.exit_timer[g, j] = rng.randint(0, 3000)
+    
+    def _reset_level(self, games):
+        """Game.reset_level for the given games."""
+        x, y = self._tile_center(*self._pacman_start)
+        self.pac_x[games] = x
+        self.pac_y[games] = y
+        self.pac_dir[games] = DIR_NONE
+        self.pac_next[games] = DIR_NONE
+        self.pac_facing[games] = DIR_RIGHT
+        self.powered_up[games] = False
+        self.powerup_start[games] = 0
+        self._reset_ghosts(games)
+        self.heart_active[games] = False
+        self.last_fire_time[games] = 0
+        self.death_animation[games] = False
+    
+    # ----- Stepping -----
+    
+    def step(self, actions):
+        """
+        Advance every playing game by one tick.
+        
+        actions holds each game's new Pac-Man direction (an index into
+        DIRECTIONS) or -1 to keep the previous one.
+        """
+        actions = np.asarray(actions)
+        playing = self.state == PLAYING
+        self.tick[playing] += 1
+        now = self.tick * 1000 // TICK_RATE
+        
+        # Death animation: lose a life once it has finished
+        dying = playing & self.death_animation
+        finished = dying & (now - self.death_time > DEATH_DURATION)
+        self.lives[finished] -= 1
+        over = finished & (self.lives <= 0)
+        self.state[over] = GAME_OVER
+        self._reset_level(np.flatnonzero(finished & ~over))
+        
+        active = playing & ~dying
+        steer = active & (actions >= 0)
+        self.pac_next[steer] = actions[steer]
+        
+        self._update_pacman(active, now)
+        self._eat_dots(active)
+        
+        won = active & (self.dots_remaining <= 0)
+        self.state[won] = WIN
+        active &= ~won
+        
+        self._update_rose(active, now)
+        self._fire_hearts(active, now)
+        self._update_hearts(active, now)
+        
+        # Ghosts move one after another; a game stops updating the rest
+        # of its ghosts on the tick one of them catches Pac-Man
+        for j in range(NUM_GHOSTS):
+            self._update_ghost(j, active, now)
+            caught = active & self.ghost_alive[:, j] & self._overlaps_pacman(
+                self.ghost_x[:, j], self.ghost_y[:, j])
+            self.death_animation[caught] = True
+            self.death_time[caught] = now[caught]
+            active &= ~caught
+    
+    def _pacman_can_move(self, x, y, direction):
+        """PacMan._can_move: all four corners clear of walls/ghost house."""
+        offset = (RADIUS - 2) * SUBPIXEL
+        test_x = x + DX[direction] * PACMAN_STEP * 2
+        test_y = y + DY[direction] * PACMAN_STEP * 2
+        can_move = np.ones(len(x), dtype=bool)
+        for corner_x in (test_x - offset, test_x + offset):
+            for corner_y in (test_y - offset, test_y + offset):
+                cell = self._cell(*self._grid(corner_x, corner_y))
+                can_move &= (cell != 1) & (cell != 3)
+        return can_move
+    
+    def _update_pacman(self, mask, now):
+        """PacMan.update for the games in mask."""
+        g = np.flatnonzero(mask)
+        x, y = self.pac_x[g], self.pac_y[g]
+        direction = self.pac_dir[g]
+        facing = self.pac_facing[g]
+        next_direction = self.pac_next[g]
+        
+        expired = self.powered_up[g] & (
+            now[g] - self.powerup_start[g] > POWERUP_DURATION)
+        self.powered_up[g[expired]] = False
+        
+        # Try to change direction if aligned with grid
+        center_x, center_y = self._tile_center(*self._grid(x, y))
+        tolerance = PACMAN_STEP + SUBPIXEL
+        aligned = ((np.abs(x - center_x) <= tolerance) &
+                   (np.abs(y - center_y) <= tolerance))
+        turn = ((next_direction != DIR_NONE) & aligned &
+                self._pacman_can_move(x, y, next_direction))
+        direction = np.where(turn, next_direction, direction)
+        facing = np.where(turn, next_direction, facing)
+        x = np.where(turn & (DX[direction] == 0), center_x, x)
+        y = np.where(turn & (DY[direction] == 0), center_y, y)
+        
+        # Move in current direction, or stop at the wall
+        moving = direction != DIR_NONE
+        can_move = moving & self._pacman_can_move(x, y, direction)
+        x = np.where(can_move, x + DX[direction] * PACMAN_STEP, x)
+        y = np.where(can_move, y + DY[direction] * PACMAN_STEP, y)
+        x = self._wrap_tunnel(x, can_move)
+        
+        blocked = moving & ~can_move
+        center_x, center_y = self._tile_center(*self._grid(x, y))
+        x = np.where(blocked & (DX[direction] == 0), center_x, x)
+        y = np.where(blocked & (DY[direction] == 0), center_y, y)
+        
+        self.pac_x[g], self.pac_y[g] = x, y
+        self.pac_dir[g] = direction
+        self.pac_facing[g] = facing
+    
+    def _wrap_tunnel(self, x, mask):
+        """Wrap positions that left the maze sideways (where mask is set)."""
+        right_edge = ORIGIN_X + self.width * TILE
+        x = np.where(mask & (x < ORIGIN_X), right_edge - HALF_TILE, x)
+        return np.where(mask & (x > right_edge), ORIGIN_X + HALF_TILE, x)
+    
+    def _eat_dots(self, mask):
+        """Maze.eat_dot at Pac-Man's tile for the games in mask."""
+        g = np.flatnonzero(mask)
+        grid_x, grid_y = self._grid(self.pac_x[g], self.pac_y[g])
+        inside = ((grid_x >= 0) & (grid_x < self.width) &
+                  (grid_y >= 0) & (grid_y < self.height))
+        g, grid_x, grid_y = g[inside], grid_x[inside], grid_y[inside]
+        index = grid_y * self.width + grid_x
+        byte, bit = index >> 3, (index & 7).astype(np.uint8)
+        has_dot = (self.dots[g, byte] >> bit) & 1 == 1
+        g, byte, bit = g[has_dot], byte[has_dot], bit[has_dot]
+        self.dots[g, byte] &= ~(np.uint8(1) << bit)
+        self.dots_remaining[g] -= 1
+        self.score[g] += DOT_SCORE
+    
+    def _overlaps_pacman(self, x, y):
+        """Rect collision of RADIUS-sized boxes at (x, y) with Pac-Man."""
+        left = _whole_pixels(x - RADIUS * SUBPIXEL)
+        top = _whole_pixels(y - RADIUS * SUBPIXEL)
+        pac_left = _whole_pixels(self.pac_x - RADIUS * SUBPIXEL)
+        pac_top = _whole_pixels(self.pac_y - RADIUS * SUBPIXEL)
+        size = RADIUS * 2
+        return ((np.abs(left - pac_left) < size) &
+                (np.abs(top - pac_top) < size))
+    
+    def _update_rose(self, mask, now):
+        """RoseManager.update for the games in mask."""
+        due = mask & ~self.rose_active & (
+            now - self.rose_last_spawn > ROSE_SPAWN_INTERVAL)
+        if self._rose_positions:
+            for g in np.flatnonzero(due):
+                grid_x, grid_y = self.rngs[g].choice(self._rose_positions)
+                self.rose_x[g], self.rose_y[g] = self._tile_center(
+                    grid_x, grid_y)
+                self.rose_active[g] = True
+                self.rose_last_spawn[g] = now[g]
+        
+        collected = mask & self.rose_active & self._overlaps_pacman(
+            self.rose_x, self.rose_y)
+        self.rose_active[collected] = False
+        self.score[collected] += ROSE_SCORE
+        self.powered_up[collected] = True
+        self.powerup_start[collected] = now[collected]
+    
+    def _fire_hearts(self, mask, now):
+        """HeartManager.fire for the games in mask."""
+        fire = (mask & self.powered_up &
+                (now - self.last_fire_time >= HEART_FIRE_RATE) &
+                (self.pac_facing != DIR_NONE))
+        slot = self.heart_active.sum(axis=1)
+        fire &= slot < MAX_HEARTS
+        g = np.flatnonzero(fire)
+        slot = slot[g]
+        self.heart_x[g, slot] = self.pac_x[g]
+        self.heart_y[g, slot] = self.pac_y[g]
+        self.heart_dir[g, slot] = self.pac_facing[g]
+        self.heart_active[g, slot] = True
+        self.last_fire_time[g] = now[g]
+    
+    def _update_hearts(self, mask, now):
+        """HeartManager.update for the games in mask."""
+        right_edge = ORIGIN_X + self.width * TILE
+        bottom_edge = ORIGIN_Y + self.height * TILE
+        for k in range(MAX_HEARTS):
+            g = np.flatnonzero(mask & self.heart_active[:, k])
+            if len(g) == 0:
+                break  # Active hearts are packed at the front
+            direction = self.heart_dir[g, k]
+            x = self.heart_x[g, k] + DX[direction] * HEART_STEP
+            y = self.heart_y[g, k] + DY[direction] * HEART_STEP
+            self.heart_x[g, k], self.heart_y[g, k] = x, y
+            
+            # Walls and leaving the maze stop a heart
+            hit_wall = self._cell(*self._grid(x, y)) == 1
+            outside = ((x < ORIGIN_X) | (x > right_edge) |
+                       (y < ORIGIN_Y) | (y > bottom_edge))
+            self.heart_active[g, k] = ~(hit_wall | outside)
+            
+            # The first live ghost it touches dies
+            heart_left = _whole_pixels(x - HEART_HALF * SUBPIXEL)
+            heart_top = _whole_pixels(y - HEART_HALF * SUBPIXEL)
+            for j in range(NUM_GHOSTS):
+                left = _whole_pixels(self.ghost_x[g, j] - RADIUS * SUBPIXEL)
+                top = _whole_pixels(self.ghost_y[g, j] - RADIUS * SUBPIXEL)
+                hit = (self.heart_active[g, k] & self.ghost_alive[g, j] &
+                       (heart_left < left + RADIUS * 2) &
+                       (left < heart_left + HEART_HALF * 2) &
+                       (heart_top < top + RADIUS * 2) &
+                       (top < heart_top + HEART_HALF * 2))
+                killed = g[hit]
+                self.ghost_alive[killed, j] = False
+                self.respawn_time[killed, j] = now[killed]
+                self.score[killed] += GHOST_SCORE
+                self.heart_active[killed, k] = False
+        
+        # Drop spent hearts, keeping the rest in firing order
+        order = np.argsort(~self.heart_active, axis=1, kind="stable")
+        for array in (self.heart_x, self.heart_y, self.heart_dir,
+                      self.heart_active):
+            array[:] = np.take_along_axis(array, order, axis=1)
+    
+    def _ghost_walkable(self, grid_x, grid_y, in_ghost_house):
+        """Whether ghosts can step onto tiles (Maze.ghost_masks and co)."""
+        cell = self._cell(grid_x, grid_y)
+        return (cell != 1) & (in_ghost_house | (cell != 3))
+    
+    def _ghost_can_move(self, x, y, direction, in_ghost_house):
+        """Ghost._can_move."""
+        grid_x, grid_y = self._grid(x, y)
+        center_x, center_y = self._tile_center(grid_x, grid_y)
+        dx, dy = DX[direction], DY[direction]
+        moving_away = (
+            ((dx > 0) & (x >= center_x - SUBPIXEL)) |
+            ((dx < 0) & (x <= center_x + SUBPIXEL)) |
+            ((dy > 0) & (y >= center_y - SUBPIXEL)) |
+            ((dy < 0) & (y <= center_y + SUBPIXEL))
+        )
+        walkable = self._ghost_walkable(grid_x + dx, grid_y + dy,
+                                        in_ghost_house)
+        return ~moving_away | walkable
+    
+    def _ghost_targets(self, j, g):
+        """get_target of ghost j (Blinky/Pinky/Inky/Clyde) for games g."""
+        pac_x, pac_y = self._grid(self.pac_x[g], self.pac_y[g])
+        facing = self.pac_facing[g]
+        if j == PINKY:
+            target_x = pac_x + DX[facing] * 4
+            target_y = pac_y + DY[facing] * 4
+        elif j == INKY:
+            blinky_x, blinky_y = self._grid(self.ghost_x[g, BLINKY],
+                                            self.ghost_y[g, BLINKY])
+            ahead_x = pac_x + DX[facing] * 2
+            ahead_y = pac_y + DY[facing] * 2
+            target_x = ahead_x + (ahead_x - blinky_x)
+            target_y = ahead_y + (ahead_y - blinky_y)
+        elif j == CLYDE:
+            grid_x, grid_y = self._grid(self.ghost_x[g, j], self.ghost_y[g, j])
+            far = (grid_x - pac_x) ** 2 + (grid_y - pac_y) ** 2 > 64
+            return (np.where(far, pac_x, 1),
+                    np.where(far, pac_y, self.height - 2))
+        else:
+            return pac_x, pac_y
+        return (np.clip(target_x, 0, self.width - 1),
+                np.clip(target_y, 0, self.height - 1))
+    
+    def _choose_directions(self, j, g):
+        """Ghost._choose_direction towards each game's target."""
+        grid_x, grid_y = self._grid(self.ghost_x[g, j], self.ghost_y[g, j])
+        current = self.ghost_dir[g, j]
+        
+        walkable = np.stack([
+            self._ghost_walkable(grid_x + DX[d], grid_y + DY[d], False)
+            for d in range(4)
+        ], axis=1)
+        forward = walkable & (np.arange(4) != OPPOSITE[current][:, None])
+        # Reversing is only allowed when there is nothing else
+        valid = np.where(forward.any(axis=1)[:, None], forward, walkable)
+        
+        target_x, target_y = self._ghost_targets(j, g)
+        target = self._path_index[
+            self._nearest_path[target_y * self.width + target_x]]
+        distance = np.stack([
+            self._path_distances(grid_x + DX[d], grid_y + DY[d], target)
+            for d in range(4)
+        ], axis=1)
+        distance[~valid] = np.inf
+        return np.where(valid.any(axis=1), distance.argmin(axis=1), current)
+    
+    def _path_distances(self, grid_x, grid_y, target):
+        """Maze.distance from tiles to path tiles (UNREACHABLE_COST for None)."""
+        grid_x = self._wrap(grid_x, grid_y)
+        inside = ((grid_x >= 0) & (grid_x < self.width) &
+                  (grid_y >= 0) & (grid_y < self.height))
+        cell = (np.clip(grid_y, 0, self.height - 1) * self.width +
+                np.clip(grid_x, 0, self.width - 1))
+        source = np.where(inside, self._path_index[cell], -1)
+        distance = self._distances[np.maximum(source, 0), target]
+        return np.where(source >= 0, distance, UNREACHABLE_COST)
+    
+    def _update_ghost(self, j, mask, now):
+        """Ghost.update of ghost j for the games in mask."""
+        alive = self.ghost_alive[:, j].copy()
+        
+        # Dead ghosts wait to respawn inside the ghost house
+        respawn = mask & ~alive & (
+            now - self.respawn_time[:, j] > GHOST_RESPAWN_TIME)
+        house_x, house_y = self._tile_center(*self._ghost_respawn)
+        self.ghost_alive[respawn, j] = True
+        self.ghost_x[respawn, j] = house_x
+        self.ghost_y[respawn, j] = house_y
+        self.in_ghost_house[respawn, j] = True
+        self.exit_timer[respawn, j] = 500
+        
+        live = mask & alive
+        in_house = live & self.in_ghost_house[:, j]
+        in_maze = live & ~self.in_ghost_house[:, j]
+        self._update_ghost_in_house(j, in_house)
+        self._update_ghost_in_maze(j, in_maze)
+    
+    def _update_ghost_in_house(self, j, mask):
+        """Count down to leaving the ghost house, then head for the exit."""
+        self.exit_timer[mask, j] -= TICK_MS
+        g = np.flatnonzero(mask & (self.exit_timer[:, j] <= 0))
+        x, y = self.ghost_x[g, j], self.ghost_y[g, j]
+        exit_x, exit_y = self._tile_center(*self._ghost_exit)
+        
+        move_x = np.abs(x - exit_x) > GHOST_STEP
+        move_y = ~move_x & (np.abs(y - exit_y) > GHOST_STEP)
+        self.ghost_x[g, j] = np.where(
+            move_x, x + np.where(x < exit_x, GHOST_STEP, -GHOST_STEP), x)
+        self.ghost_y[g, j] = np.where(
+            move_y, y + np.where(y < exit_y, GHOST_STEP, -GHOST_STEP), y)
+        
+        left = g[~move_x & ~move_y]
+        self.in_ghost_house[left, j] = False
+        self.ghost_dir[left, j] = DIR_LEFT
+        self.last_grid_x[left, j], self.last_grid_y[left, j] = self._ghost_exit
+        self.made_decision[left, j] = True
+    
+    def _update_ghost_in_maze(self, j, mask):
+        """Chase the target, deciding once per tile at its centre."""
+        g = np.flatnonzero(mask)
+        x, y = self.ghost_x[g, j], self.ghost_y[g, j]
+        grid_x, grid_y = self._grid(x, y)
+        
+        new_tile = ((grid_x != self.last_grid_x[g, j]) |
+                    (grid_y != self.last_grid_y[g, j]))
+        self.last_grid_x[g, j] = grid_x
+        self.last_grid_y[g, j] = grid_y
+        self.made_decision[g[new_tile], j] = False
+        
+        center_x, center_y = self._tile_center(grid_x, grid_y)
+        tolerance = GHOST_STEP + SUBPIXEL
+        aligned = ((np.abs(x - center_x) <= tolerance) &
+                   (np.abs(y - center_y) <= tolerance))
+        decide = aligned & ~self.made_decision[g, j]
+        d = g[decide]
+        if len(d):
+            new_direction = self._choose_directions(j, d)
+            turn = self._ghost_can_move(x[decide], y[decide], new_direction,
+                                        False)
+            self.ghost_dir[d[turn], j] = new_direction[turn]
+            self.made_decision[d, j] = True
+        
+        # Move on, or take the first open direction when blocked
+        direction = self.ghost_dir[g, j]
+        can_move = self._ghost_can_move(x, y, direction, False)
+        for d in range(4):
+            stuck = ~can_move
+            if not stuck.any():
+                break
+            free = stuck & self._ghost_can_move(x, y, np.full(len(g), d), False)
+            direction = np.where(free, d, direction)
+            can_move |= free
+        x = np.where(can_move, x + DX[direction] * GHOST_STEP, x)
+        y = np.where(can_move, y + DY[direction] * GHOST_STEP, y)
+        
+        self.ghost_x[g, j] = self._wrap_tunnel(x, np.ones(len(g), dtype=bool))
+        self.ghost_y[g, j] = y
+        self.ghost_dir[g, j] = direction
+
+
+def _whole_pixels(steps):
+    """Sub-pixel positions as whole pixels, truncated like pygame.Rect."""
+    return np.trunc(steps / SUBPIXEL)
+
+
+def random_actions(rng, n_games, n_ticks, turn_interval=30):
+    """Action schedule turning each game's Pac-Man randomly now and then."""
+    actions = np.full((n_games, n_ticks), -1, dtype=np.int64)
+    turns = np.arange(0, n_ticks, turn_interval)
+    actions[:, turns] = rng.integers(0, 4, size=(n_games, len(turns)))
+    return actions
+
+
+def verify_parity(n_games=8, n_ticks=3000, seed=0):
+    """
+    Play seeded games with both Game.update and BatchSim and compare them.
+    
+    Returns a list of mismatch descriptions (empty when they agree).
+    """
+    from game import Game
+    
+    seeds = [seed + i for i in range(n_games)]
+    schedule = random_actions(np.random.default_rng(seed), n_games, n_ticks)
+    
+    # Scalar games, one after the other, seeded like the batch games
+    scalar = []
+    for i, game_seed in enumerate(seeds):
+        def policy(game, actions=schedule[i]):
+            action = actions[game.tick - 1]
+            return DIRECTIONS[action] if action >= 0 else None
+        
+        game = Game(None, policy=policy)
+        game.reset_game(game_seed)
+        for _ in range(n_ticks):
+            game.update()
+        scalar.append(game)
+    
+    batch = BatchSim(seeds)
+    all_games = np.arange(n_games)
+    for _ in range(n_ticks):
+        batch.step(schedule[all_games, np.minimum(batch.tick, n_ticks - 1)])
+    
+    mismatches = []
+    states = batch.get_states()
+    for i, game in enumerate(scalar):
+        expected = {
+            "state": game.state, "tick": game.tick, "score": game.score,
+            "lives": game.lives,
+            "pacman": (game.pacman.sub_x, game.pacman.sub_y),
+            "ghosts": [(g.sub_x, g.sub_y, g.alive) for g in game.ghosts],
+            "dots": game.maze.dots_remaining,
+            "rose": game.rose_manager.rose.active,
+        }
+        actual = {
+            "state": states[i], "tick": int(batch.tick[i]),
+            "score": int(batch.score[i]), "lives": int(batch.lives[i]),
+            "pacman": (int(batch.pac_x[i]), int(batch.pac_y[i])),
+            "ghosts": [(int(batch.ghost_x[i, j]), int(batch.ghost_y[i, j]),
+                        bool(batch.ghost_alive[i, j]))
+                       for j in range(NUM_GHOSTS)],
+            "dots": int(batch.dots_remaining[i]),
+            "rose": bool(batch.rose_active[i]),
+        }
+        for key in expected:
+            if expected[key] != actual[key]:
+                mismatches.append(f"game {i} {key}: Game={expected[key]} "
+                                  f"BatchSim={actual[key]}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=256)
+    parser.add_argument("--ticks", type=int, default=TICK_RATE * 60)
+    parser.add_argument("--parity", action="store_true",
+                        help="check BatchSim against Game.update instead")
+    args = parser.parse_args()
+    
+    if args.parity:
+        mismatches = verify_parity(n_ticks=args.ticks)
+        print("\n".join(mismatches) or "BatchSim matches Game.update")
+        raise SystemExit(1 if mismatches else 0)
+    
+    sim = BatchSim(range(args.games))
+    schedule = random_actions(np.random.default_rng(0), args.games, args.ticks)
+    all_games = np.arange(args.games)
+    start = time.perf_counter()
+    for _ in range(args.ticks):
+        sim.step(schedule[all_games, np.minimum(sim.tick, args.ticks - 1)])
+    elapsed = time.perf_counter() - start
+    
+    game_ticks = int(sim.tick.sum())
+    print(f"{args.games} games x {args.ticks} ticks in {elapsed:.2f}s = "
+          f"{game_ticks / elapsed:.0f} game ticks/s")
+    print(f"mean score {sim.score.mean():.0f}, "
+          f"{(sim.state == PLAYING).sum()} still playing")
+
+
+if __name__ == "__main__":
+    main()
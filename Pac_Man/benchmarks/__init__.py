@@ -0,0 +1,15 @@
+"""
+Benchmarks for Valentine's Pac-Man game.
+Times the game's hot paths (micro-benchmarks of single calls, and whole
+headless ticks) and checks the results against a stored baseline.
+
+Usage (from the Pac_Man folder):
+    python -m benchmarks [-k NAME] [--output results.json]
+                         [--baseline FILE] [--threshold 0.25]
+                         [--memory] [--save-baseline]
+"""
+
+from benchmarks.cases import CASES
+from benchmarks.runner import (
+    compare, load_results, measure_peak_memory, run_benchmarks, save_results
+)
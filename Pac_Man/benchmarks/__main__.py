@@ -0,0 +1,81 @@
+"""
+Run the benchmarks and compare them with the stored baseline.
+Exits with status 1 if any case regressed beyond the threshold.
+"""
+
+import argparse
+import os
+import sys
+
+# No window needed (must be set before pygame is imported)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from benchmarks.cases import CASES
+from benchmarks.runner import (
+    DEFAULT_REPEAT, DEFAULT_THRESHOLD, compare, load_results,
+    run_benchmarks, save_results
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def print_comparison(rows, threshold):
+    """Print the baseline comparison as a table."""
+    print()
+    print(f"{'case':<28}{'baseline us':>13}{'now us':>11}{'change':>9}  "
+          f"status (threshold {threshold:.0%})")
+    for name, previous, current, change, status in rows:
+        previous = "-" if previous is None else f"{previous:.2f}"
+        change = "-" if change is None else f"{change:+.1%}"
+        print(f"{name:<28}{previous:>13}{current:>11.2f}{change:>9}  "
+              f"{status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Time the game's hot paths against a baseline.")
+    parser.add_argument("-k", dest="pattern",
+                        help="only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="runs per case; the best is kept")
+    parser.add_argument("--output", help="write the results to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="baseline results to compare with")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown (fraction) counted as a regression")
+    parser.add_argument("--memory", action="store_true",
+                        help="also record each case's peak memory (slower)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as the new baseline")
+    args = parser.parse_args()
+    
+    results = run_benchmarks(
+        CASES, repeat=args.repeat, pattern=args.pattern,
+        report=lambda name, us: print(f"{name:<28}{us:>11.2f} us/op"),
+        memory=args.memory)
+    if args.memory:
+        print()
+        for name, result in results["results"].items():
+            print(f"{name:<28}{result['peak_kb']:>11.1f} KiB peak")
+    if args.output:
+        save_results(results, args.output)
+    if args.save_baseline:
+        save_results(results, args.baseline)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline} (run with --save-baseline)")
+        return 0
+    rows = compare(results, load_results(args.baseline), args.threshold)
+    print_comparison(rows, args.threshold)
+    regressions = [row[0] for row in rows if row[4] == "regression"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
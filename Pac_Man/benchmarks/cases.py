@@ -0,0 +1,254 @@
+"""
+Benchmark cases for the game's hot paths.
+Each setup function prepares one case and returns run(n), which performs
+n operations of it; CASES lists (name, setup, operations per run).
+"""
+
+import random
+
+import pygame
+
+from config import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, TICK_MS, STATE_PLAYING, UP, DOWN, LEFT,
+    RIGHT
+)
+from game import Game
+from headless import random_policy
+from maze import Maze, MAZE_LAYOUT
+from maze_gen import generate_layout
+from pacman import PacMan
+from projectile import HeartManager
+from swarm import scatter_ghosts
+
+DIRECTIONS = [UP, DOWN, LEFT, RIGHT]
+HEAVY_HEARTS = 256  # Hearts in flight for the heavy projectile load
+LARGE_MAZE_TILING = 3  # The large maze is the standard one, 3x3 times over
+SWARM_GHOSTS = 256  # Ghosts in the swarm frame case
+GENERATED_SIZE = 512  # Tiles per side of the generated maze cases
+
+
+def _get_screen():
+    """The display surface, opening a window the first time."""
+    screen = pygame.display.get_surface()
+    if screen is None:
+        pygame.init()
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    return screen
+
+
+def large_maze():
+    """A synthetic large maze: copies of the standard one side by side."""
+    rows = [row * LARGE_MAZE_TILING for row in MAZE_LAYOUT]
+    return Maze(rows * LARGE_MAZE_TILING)
+
+
+def maze_draw():
+    """Maze.draw of the standard maze (static layer plus dots)."""
+    screen = _get_screen()
+    maze = Maze()
+    maze.draw(screen)  # Build the cached layers first
+    
+    def run(n):
+        for _ in range(n):
+            maze.draw(screen)
+    
+    return run
+
+
+def maze_eat_dot():
+    """Maze.eat_dot over every tile in turn (dots, walls and eaten dots)."""
+    maze = Maze()
+    tiles = [(x, y) for y in range(maze.height) for x in range(maze.width)]
+    
+    def run(n):
+        for i in range(n):
+            if i % len(tiles) == 0:
+                maze.reset()
+                maze.pop_dirty_rects()
+            maze.eat_dot(*tiles[i % len(tiles)])
+    
+    return run
+
+
+def ghost_update(name):
+    """Make a setup for Ghost.update of one ghost, chasing a moving target."""
+    def setup():
+        game = Game(None, seed=0)
+        ghost = next(g for g in game.ghosts if g.name == name)
+        targets = [PacMan(x, y) for x, y in game.maze.spawn_positions]
+        rng = random.Random()
+        
+        def run(n):
+            # Every run replays the same moves from the start
+            game.reset_game(0)
+            ghost.exit_timer = 0  # Leave the ghost house straight away
+            rng.seed(0)
+            pacman = game.pacman
+            for tick in range(1, n + 1):
+                if tick % 120 == 0:
+                    pacman = rng.choice(targets)  # Pac-Man moved
+                ghost.update(pacman, game.maze, tick * TICK_MS)
+        
+        run(600)  # Flow fields and caches built
+        return run
+    
+    return setup
+
+
+def pacman_update():
+    """PacMan.update, turning at random every half second."""
+    maze = Maze()
+    pacman = PacMan(*maze.get_pacman_start())
+    rng = random.Random()
+    
+    def run(n):
+        pacman.reset()
+        rng.seed(0)
+        for tick in range(1, n + 1):
+            if tick % 30 == 0:
+                pacman.next_direction = rng.choice(DIRECTIONS)
+            pacman.update(maze, tick * TICK_MS)
+    
+    return run
+
+
+def pacman_draw(powered_up):
+    """Make a setup for PacMan.draw, cycling through its frames."""
+    def setup():
+        screen = _get_screen()
+        pacman = PacMan(*Maze().get_pacman_start())
+        pacman.powered_up = powered_up
+        
+        def run(n):
+            for i in range(n):
+                pacman.facing_direction = DIRECTIONS[i % 4]
+                pacman.mouth_angle = 5 + 5 * (i % 9)
+                pacman.draw(screen, i * TICK_MS)
+        
+        run(200)  # Fill the sprite atlas
+        return run
+    
+    return setup
+
+
+def heart_manager_update():
+    """HeartManager.update with HEAVY_HEARTS hearts flying among ghosts."""
+    game = Game(None, seed=0)
+    game.reset_game(0)
+    maze, ghosts = game.maze, game.ghosts
+    rng = random.Random(0)
+    
+    # Ghosts spread around the maze, and Pac-Men to fire hearts from
+    spawns = maze.spawn_positions
+    for ghost in ghosts:
+        ghost.place(*rng.choice(spawns))
+    shooters = []
+    for x, y in rng.sample(spawns, 64):
+        shooter = PacMan(x, y)
+        shooter.powered_up = True
+        shooter.facing_direction = rng.choice(DIRECTIONS)
+        shooters.append(shooter)
+    
+    manager = HeartManager(capacity=HEAVY_HEARTS)
+    manager.fire_rate = 0
+    state = {"tick": 0}
+    
+    def run(n):
+        for _ in range(n):
+            state["tick"] += 1
+            now = state["tick"] * TICK_MS
+            while manager.count < HEAVY_HEARTS:
+                manager.fire(shooters[manager.count % len(shooters)], now)
+            for ghost in manager.update(maze, ghosts, now):
+                ghost.alive = True  # Keep every ghost a target
+    
+    return run
+
+
+def game_tick(make_maze):
+    """Make a setup for full headless Game.update ticks on a maze."""
+    def setup():
+        rng = random.Random()
+        game = Game(None, policy=random_policy(rng), seed=0, maze=make_maze())
+        
+        def run(n):
+            # Every run replays the same games from the start, since how
+            # long a tick takes depends on what is going on in the game
+            rng.seed(0)
+            seed = 0
+            game.reset_game(seed)
+            for _ in range(n):
+                if game.state != STATE_PLAYING:
+                    seed += 1
+                    game.reset_game(seed)
+                game.update()
+        
+        run(600)  # Path data built and cached
+        return run
+    
+    return setup
+
+
+def swarm_frame():
+    """A whole frame (tick and dirty-rect draw) with SWARM_GHOSTS ghosts."""
+    screen = _get_screen()
+    rng = random.Random()
+    game = Game(screen, policy=random_policy(rng), seed=0,
+                ghost_count=SWARM_GHOSTS)
+    
+    def run(n):
+        # Every run starts from the same spread-out swarm
+        rng.seed(0)
+        game.reset_game(0)
+        scatter_ghosts(game, rng)
+        game.draw()
+        for _ in range(n):
+            if game.state != STATE_PLAYING:
+                game.reset_game(0)
+            game.update()
+            game.draw()
+    
+    run(60)  # Sprites and path data built
+    return run
+
+
+def maze_generate():
+    """generate_layout of a GENERATED_SIZE square maze, a new seed each."""
+    def run(n):
+        for seed in range(n):
+            generate_layout(GENERATED_SIZE, GENERATED_SIZE, seed)
+    
+    return run
+
+
+def maze_build_generated():
+    """Maze() and its first flow field on a GENERATED_SIZE generated maze."""
+    layout = generate_layout(GENERATED_SIZE, GENERATED_SIZE, 0)
+    
+    def run(n):
+        for _ in range(n):
+            Maze.clear_layout_caches()  # Build it all again each time
+            maze = Maze(layout)
+            maze.get_flow_field(*maze.get_pacman_start())
+        Maze.clear_layout_caches()
+    
+    return run
+
+
+CASES = [
+    ("maze.draw", maze_draw, 2000),
+    ("maze.eat_dot", maze_eat_dot, 20000),
+    ("ghost.update.blinky", ghost_update("Blinky"), 5000),
+    ("ghost.update.pinky", ghost_update("Pinky"), 5000),
+    ("ghost.update.inky", ghost_update("Inky"), 5000),
+    ("ghost.update.clyde", ghost_update("Clyde"), 5000),
+    ("pacman.update", pacman_update, 10000),
+    ("pacman.draw", pacman_draw(False), 5000),
+    ("pacman.draw.powered", pacman_draw(True), 5000),
+    ("heart_manager.update.heavy", heart_manager_update, 200),
+    ("game.tick.stock", game_tick(Maze), 3000),
+    ("game.tick.large", game_tick(large_maze), 3000),
+    ("game.frame.swarm", swarm_frame, 60),
+    ("maze_gen.generate.512", maze_generate, 2),
+    ("maze.build.generated.512", maze_build_generated, 1),
+]
@@ -0,0 +1,133 @@
+"""
+Benchmark runner: times cases, saves results and compares them.
+"""
+
+import gc
+import json
+import platform
+import time
+import tracemalloc
+
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.25  # Slowdown (as a fraction) counted as a regression
+
+
+def time_case(setup, number, repeat=DEFAULT_REPEAT):
+    """
+    Time one case: microseconds per operation, best of repeat runs.
+    
+    setup() prepares the case and returns run(n), which performs n
+    operations. The best run is the one least disturbed by the rest of
+    the machine, so it is the most repeatable figure. As with timeit, the
+    garbage collector is off while timing, so earlier cases' leftovers
+    don't change the result.
+    """
+    run = setup()
+    best = float("inf")
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run(number)
+            best = min(best, time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best / number * 1e6
+
+
+def measure_peak_memory(setup, number):
+    """
+    Peak memory one run of a case allocates, in kilobytes.
+    
+    Tracing allocations slows everything down, so this is a separate run
+    from the timed ones.
+    """
+    run = setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run(number)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def run_benchmarks(cases, repeat=DEFAULT_REPEAT, pattern=None, report=None,
+                   memory=False):
+    """
+    Time every case (name, setup, number) whose name contains pattern.
+    
+    Returns results as saved by save_results; report(name, us_per_op) is
+    called as each case finishes. With memory, each case also gets one
+    more run to record its peak memory (peak_kb).
+    """
+    results = {}
+    for name, setup, number in cases:
+        if pattern is not None and pattern not in name:
+            continue
+        us_per_op = time_case(setup, number, repeat)
+        results[name] = {
+            "us_per_op": round(us_per_op, 3),
+            "number": number,
+            "repeat": repeat,
+        }
+        if memory:
+            results[name]["peak_kb"] = round(
+                measure_peak_memory(setup, number), 1)
+        if report is not None:
+            report(name, us_per_op)
+    return {
+        "machine": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "processor": platform.machine(),
+        },
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "results": results,
+    }
+
+
+def save_results(results, path):
+    """Write benchmark results to a JSON file."""
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path):
+    """Read benchmark results saved by save_results."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare results with a baseline, case by case.
+    
+    Returns rows of (name, baseline us, current us, change, status), where
+    change is the relative slowdown (negative when faster) and status is
+    "regression" beyond threshold, "faster" beyond it the other way, "new"
+    for cases missing from the baseline, or "ok".
+    """
+    rows = []
+    for name, result in results["results"].items():
+        current = result["us_per_op"]
+        previous = baseline["results"].get(name)
+        if previous is None:
+            rows.append((name, None, current, None, "new"))
+            continue
+        previous = previous["us_per_op"]
+        change = current / previous - 1
+        if change > threshold:
+            status = "regression"
+        elif change < -threshold:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((name, previous, current, change, status))
+    return rows
@@ -0,0 +1,72 @@
+"""
+Collision helpers for Valentine's Pac-Man game.
+A box overlap test on entities' cached bounds (no pygame.Rect
+allocation) and a uniform-grid spatial hash to find which entities are
+worth testing.
+"""
+
+from config import TILE_SIZE
+
+# Spatial hash keys pack a cell's (x, y) into one int
+_ROW_STRIDE = 1 << 16
+
+
+def entities_overlap(a, b):
+    """
+    Check if two entities' square collision boxes overlap.
+    
+    Gives exactly what Rect.colliderect would for the same boxes. Each
+    entity keeps whole-pixel left, top and box_size attributes up to
+    date as it moves, so a test reads them instead of building Rects.
+    """
+    return (a.left < b.left + b.box_size and b.left < a.left + a.box_size and
+            a.top < b.top + b.box_size and b.top < a.top + a.box_size)
+
+
+class SpatialHash:
+    """
+    Entities bucketed by grid cell, for a cheap broadphase.
+    
+    Anything that can touch an entity must lie within cell_size of its
+    position, so a query only has to look at the 3x3 block of cells
+    around it.
+    """
+    
+    def __init__(self, cell_size=TILE_SIZE):
+        self.cell_size = cell_size
+        self._cells = {}
+        self._found = []  # Reused for query's result
+    
+    def clear(self):
+        """Remove every entity (keeping the buckets for reuse)."""
+        for bucket in self._cells.values():
+            bucket.clear()
+    
+    def insert(self, item, x, y):
+        """Add an item (an index, e.g. into a list of ghosts) at (x, y)."""
+        key = (int(y // self.cell_size) * _ROW_STRIDE +
+               int(x // self.cell_size))
+        bucket = self._cells.get(key)
+        if bucket is None:
+            self._cells[key] = [item]
+        else:
+            bucket.append(item)
+    
+    def query(self, x, y):
+        """
+        Get the items in the cells around (x, y), in ascending order.
+        
+        The list is reused by the next query, so finish with it first.
+        """
+        center = (int(y // self.cell_size) * _ROW_STRIDE +
+                  int(x // self.cell_size))
+        found = self._found
+        found.clear()
+        for row in (center - _ROW_STRIDE, center, center + _ROW_STRIDE):
+            for key in (row - 1, row, row + 1):
+                bucket = self._cells.get(key)
+                if bucket:
+                    found.extend(bucket)
+        if len(found) > 1:
+            found.sort()  # Keep the caller's order (e.g. ghost order)
+        return found
@@ -16,14 +16,23 @@ MAZE_OFFSET_X = 0
 MAZE_OFFSET_Y = 40  # Space for score/lives display
 
 # Game settings
-FPS = 60
-PACMAN_SPEED = 2
+FPS = 60  # Render frame rate cap
+TICK_RATE = 60  # Simulation ticks per second (independent of FPS)
+TICK_MS = 1000 / TICK_RATE
+MAX_TICKS_PER_FRAME = 5  # Catch-up limit before the game slows down
+DIRTY_RECT_RENDERING = True  # Only redraw/present the areas that changed
+PACMAN_SPEED = 2  # Pixels per simulation tick
 GHOST_SPEED = 1.8
 HEART_SPEED = 6
+SUBPIXEL = 10  # Positions are kept in whole 1/SUBPIXEL pixel steps
 POWERUP_DURATION = 5000  # milliseconds
 HEART_FIRE_RATE = 300    # milliseconds between heart shots
+MAX_HEARTS = 16  # Hearts in flight at once (about 6 is the real maximum)
 ROSE_SPAWN_INTERVAL = 12000  # milliseconds between rose spawns
 GHOST_RESPAWN_TIME = 3000  # milliseconds
+GHOST_COUNT = 4  # Ghosts per game; more than 4 makes a swarm (see ghost.py)
+SWARM_EXIT_INTERVAL = 150  # milliseconds between swarm ghosts leaving home
+SWARM_GHOST_STEP = 16  # Ghosts added or removed by the ] and [ keys
 
 # Valentine color palette
 WALL_COLOR = (219, 112, 147)      # Pale violet red
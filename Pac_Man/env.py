@@ -0,0 +1,113 @@
+"""
+Gym-style environment for Valentine's Pac-Man game.
+Wraps a headless Game with reset()/step(action) for reinforcement
+learning. Observations are stacked bitplanes over the maze grid.
+
+Usage:
+    env = PacManEnv(frame_skip=4)
+    obs = env.reset(seed=0)
+    obs, reward, done, info = env.step(env.action_space.index(UP))
+"""
+
+import numpy as np
+
+from config import STATE_PLAYING, UP, DOWN, LEFT, RIGHT, NONE
+from game import Game
+
+# Observation planes
+PLANE_WALLS = 0
+PLANE_DOTS = 1
+PLANE_PACMAN = 2
+PLANE_GHOSTS = 3  # One plane per ghost, in create_ghosts order
+ENV_GHOSTS = 4  # The environment always plays the classic four ghosts
+PLANE_HEARTS = PLANE_GHOSTS + ENV_GHOSTS
+PLANE_ROSE = PLANE_HEARTS + 1
+NUM_PLANES = PLANE_ROSE + 1
+
+
+class PacManEnv:
+    """reset()/step() environment over a headless Game."""
+    
+    # Action index -> Pac-Man direction (NONE keeps the current one)
+    action_space = [NONE, UP, DOWN, LEFT, RIGHT]
+    
+    def __init__(self, frame_skip=1):
+        """
+        frame_skip is how many game ticks each step() simulates; the
+        action is held for all of them and one observation is returned.
+        """
+        self.frame_skip = frame_skip
+        self.game = Game(None, ghost_count=ENV_GHOSTS)  # Not GHOST_COUNT
+        maze = self.game.maze
+        
+        # One preallocated buffer, updated in place; callers get a read-only
+        # view of it (copy it to keep an observation past the next step)
+        self._buffer = np.zeros((NUM_PLANES, maze.height, maze.width),
+                                dtype=np.uint8)
+        layout = np.frombuffer(maze.cells, dtype=np.uint8).reshape(
+            maze.height, maze.width)
+        self._buffer[PLANE_WALLS] = layout == 1
+        self._initial_dots = (layout == 0).astype(np.uint8)
+        self.observation = self._buffer.view()
+        self.observation.flags.writeable = False
+    
+    def reset(self, seed=None):
+        """Start a new game (from seed, if given); return the observation."""
+        if len(self.game.ghosts) != ENV_GHOSTS:
+            raise ValueError(f"observations have planes for {ENV_GHOSTS} "
+                             f"ghosts, not {len(self.game.ghosts)}")
+        self.game.reset_game(seed)
+        np.copyto(self._buffer[PLANE_DOTS], self._initial_dots)
+        self._dots_remaining = self.game.maze.dots_remaining
+        self._update_entities()
+        return self.observation
+    
+    def step(self, action):
+        """
+        Steer Pac-Man and advance frame_skip ticks.
+        
+        Returns (observation, reward, done, info) where reward is the score
+        gained and done is set once the game is lost or won.
+        """
+        game = self.game
+        direction = self.action_space[action]
+        start_score = game.score
+        for _ in range(self.frame_skip):
+            if direction != NONE:
+                game.pacman.next_direction = direction
+            game.update()
+            if game.maze.dots_remaining != self._dots_remaining:
+                # The only dot eaten in a tick is the one under Pac-Man
+                self._buffer[PLANE_DOTS, game.pacman.get_grid_y(),
+                             game.pacman.get_grid_x()] = 0
+                self._dots_remaining = game.maze.dots_remaining
+            if game.state != STATE_PLAYING:
+                break
+        
+        self._update_entities()
+        info = {"score": game.score, "lives": game.lives, "tick": game.tick}
+        return (self.observation, game.score - start_score,
+                game.state != STATE_PLAYING, info)
+    
+    def _update_entities(self):
+        """Redraw the moving-entity planes of the observation buffer."""
+        game = self.game
+        planes = self._buffer[PLANE_PACMAN:]
+        planes.fill(0)
+        self._mark(PLANE_PACMAN, game.pacman.get_grid_x(),
+                   game.pacman.get_grid_y())
+        for i, ghost in enumerate(game.ghosts):
+            if ghost.alive:
+                self._mark(PLANE_GHOSTS + i, ghost.get_grid_x(),
+                           ghost.get_grid_y())
+        for heart in game.heart_manager.hearts:
+            self._mark(PLANE_HEARTS, heart.grid_x, heart.grid_y)
+        rose = game.rose_manager.rose
+        if rose.active:
+            self._mark(PLANE_ROSE, rose.grid_x, rose.grid_y)
+    
+    def _mark(self, plane, grid_x, grid_y):
+        """Set one cell of a plane, ignoring positions off the maze."""
+        _, height, width = self._buffer.shape
+        if 0 <= grid_x < width and 0 <= grid_y < height:
+            self._buffer[plane, grid_y, grid_x] = 1
@@ -3,56 +3,131 @@ Main game logic for Valentine's Pac-Man game.
 Handles game states, collisions, scoring, and rendering.
 """
 
+import random
+import time
+
 import pygame
 from config import (
     SCREEN_WIDTH, SCREEN_HEIGHT, BG_COLOR, TEXT_COLOR,
+    MAZE_OFFSET_Y, DIRTY_RECT_RENDERING, TICK_RATE,
     DOT_SCORE, GHOST_SCORE, ROSE_SCORE, STARTING_LIVES,
     STATE_START, STATE_PLAYING, STATE_PAUSED, STATE_GAME_OVER, STATE_WIN,
-    HEART_COLOR, WALL_COLOR
+    HEART_COLOR, WALL_COLOR, GHOST_COUNT, SWARM_GHOST_STEP
 )
 from maze import Maze
 from pacman import PacMan
-from ghost import create_ghosts
+from ghost import create_ghosts, draw_ghosts, get_wave_phase
 from powerup import RoseManager
+from profiler import FrameProfiler
 from projectile import HeartManager
+from sprite_cache import SpriteCache
+
+PROFILER_REFRESH_FRAMES = 30  # Frames between profiler overlay updates
 
 
 class Game:
     """Main game class handling all game logic."""
     
-    def __init__(self, screen):
+    def __init__(self, screen, policy=None, seed=None, maze=None,
+                 ghost_count=GHOST_COUNT):
+        """
+        Create a game drawing to screen.
+        
+        Pass screen=None to run headless (no display or fonts; only update
+        is used). policy, if given, is called as policy(game) every tick
+        and returns Pac-Man's next direction (or None to keep it) in place
+        of keyboard input. seed fixes the game's random choices (ghost exit
+        times, rose spawns) so that runs can be reproduced; without one
+        every game gets a fresh seed. maze is the Maze to play in (by
+        default the standard layout). ghost_count above four plays with a
+        swarm of ghosts (see create_ghosts).
+        """
         self.screen = screen
+        self.headless = screen is None
+        self.policy = policy
         self.running = True
         self.state = STATE_START
         
+        # All of the game's randomness comes from here
+        self.seed = seed
+        self.run_seed = seed  # Seed of the game in progress
+        self.rng = random.Random(seed)
+        
+        # Optional replay.InputRecorder, and the keys held at the last event
+        # poll (applied each tick so that they can be recorded)
+        self.recorder = None
+        self._pressed_keys = None
+        
+        # profiler.FrameProfiler while profiling (F3), else None; the main
+        # loop and draw only time phases when it is set
+        self.profiler = None
+        self._profiler_overlay = None  # (refresh number, rendered summary)
+        self._profiler_font = None  # Loaded the first time it is shown
+        
         # Initialize game objects
-        self.maze = Maze()
+        self.maze = maze if maze is not None else Maze()
         
         # Initialize Pac-Man
         start_x, start_y = self.maze.get_pacman_start()
         self.pacman = PacMan(start_x, start_y)
         
         # Initialize ghosts
-        self.ghosts = create_ghosts(self.maze)
+        self._create_ghosts(ghost_count)
         
         # Initialize managers
-        self.rose_manager = RoseManager()
+        self.rose_manager = RoseManager(self.rng)
         self.heart_manager = HeartManager()
         
         # Game state
         self.score = 0
         self.lives = STARTING_LIVES
         self.level = 1
+        self.ghosts_killed = 0  # By hearts, this game
+        
+        # Simulation clock, advanced one fixed tick per update
+        self.tick = 0
+        self.sim_time = 0  # milliseconds
         
         # Fonts
-        self.font_large = pygame.font.Font(None, 64)
-        self.font_medium = pygame.font.Font(None, 36)
-        self.font_small = pygame.font.Font(None, 24)
+        if not self.headless:
+            self.font_large = pygame.font.Font(None, 64)
+            self.font_medium = pygame.font.Font(None, 36)
+            self.font_small = pygame.font.Font(None, 24)
+        
+        # Rendered text: static strings in an LRU cache, changing values
+        # (score, power-up timer) re-rendered only when they change
+        self._text_cache = SpriteCache(max_entries=64)
+        self._value_surfaces = {}
         
         # Death animation
         self.death_animation = False
         self.death_time = 0
         self.death_duration = 1500  # milliseconds
+        
+        # Dirty-rect rendering: areas drawn last frame and what the HUD showed
+        self.dirty_rect_rendering = DIRTY_RECT_RENDERING
+        self._prev_draw_rects = []
+        self._hud_values = None
+        self._needs_full_redraw = True
+        self._last_drawn_state = None
+        
+        # Freeze-frame for non-playing states: the state shown on screen,
+        # its composed frame and the translucent overlays
+        self._frozen_state = None
+        self._frozen_frame = None
+        self._overlays = {}
+    
+    def _create_ghosts(self, count):
+        """Make count ghosts, with their sprites ready to draw."""
+        self.ghosts = create_ghosts(self.maze, self.rng, count)
+        if not self.headless:
+            for ghost_class in {type(ghost) for ghost in self.ghosts}:
+                ghost_class.register_sprite_variants()
+    
+    def set_ghost_count(self, count):
+        """Play with count ghosts (at least one), starting a new game."""
+        self._create_ghosts(max(1, count))
+        self.reset_game()
     
     def reset_level(self):
         """Reset the level after death or for new level."""
@@ -61,15 +136,28 @@ class Game:
             ghost.reset()
         self.heart_manager.reset()
         self.death_animation = False
+        self._needs_full_redraw = True
     
-    def reset_game(self):
-        """Reset the entire game."""
+    def reset_game(self, seed=None):
+        """Reset the entire game, seeded with seed (or the game's seed)."""
+        if seed is None:
+            seed = self.seed
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.run_seed = seed
+        self.rng.seed(seed)
+        if self.recorder is not None:
+            self.recorder.start(seed, len(self.ghosts))
+        
         self.maze.reset()
         self.reset_level()
         self.rose_manager.reset()
+        self.tick = 0
+        self.sim_time = 0
         self.score = 0
         self.lives = STARTING_LIVES
         self.level = 1
+        self.ghosts_killed = 0
         self.state = STATE_PLAYING
     
     def handle_events(self):
@@ -79,7 +167,22 @@ class Game:
                 self.running = False
                 return
             
+            if event.type == pygame.VIDEOEXPOSE:
+                # Window contents were lost, so redraw everything
+                self._needs_full_redraw = True
+            
             if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F9 and self.recorder is not None:
+                    self._save_recording()
+                if event.key == pygame.K_F3:
+                    self._toggle_profiler()
+                if event.key == pygame.K_F4 and self.profiler is not None:
+                    self._save_profile()
+                if event.key == pygame.K_RIGHTBRACKET:
+                    self.set_ghost_count(len(self.ghosts) + SWARM_GHOST_STEP)
+                if event.key == pygame.K_LEFTBRACKET:
+                    self.set_ghost_count(len(self.ghosts) - SWARM_GHOST_STEP)
+                
                 if self.state == STATE_START:
                     if event.key == pygame.K_SPACE:
                         self.reset_game()
@@ -103,16 +206,49 @@ class Game:
                         self.reset_game()
         
         # Handle continuous key presses for movement
-        if self.state == STATE_PLAYING and not self.death_animation:
-            keys = pygame.key.get_pressed()
-            self.pacman.handle_input(keys)
+        if self.state == STATE_PLAYING and self.policy is None:
+            self._pressed_keys = pygame.key.get_pressed()
+    
+    def _save_recording(self):
+        """Save the game so far for replay.py (F9), e.g. for bug reports."""
+        self.recorder.finish(self)
+        path = f"replay-{self.run_seed}-{self.tick}.json"
+        try:
+            self.recorder.save(path)
+        except OSError:
+            pass  # No writable file system (e.g. in the browser)
+    
+    def _toggle_profiler(self):
+        """Start (with an empty history) or stop profiling frames (F3)."""
+        if self.profiler is None:
+            self.profiler = FrameProfiler()
+        else:
+            self.profiler = None
+        self._profiler_overlay = None
+        self._needs_full_redraw = True
+    
+    def _save_profile(self):
+        """Save the profiled frames as CSV and Chrome trace JSON (F4)."""
+        path = time.strftime("profile-%Y%m%d-%H%M%S")
+        try:
+            self.profiler.save_csv(path + ".csv")
+            self.profiler.save_chrome_trace(path + ".json")
+        except OSError:
+            pass  # No writable file system (e.g. in the browser)
+    
+    def _profile(self, phase):
+        """Charge the time since the last mark to phase, when profiling."""
+        if self.profiler is not None:
+            self.profiler.mark(phase)
     
     def update(self):
-        """Update game state."""
+        """Advance the game state by one simulation tick."""
         if self.state != STATE_PLAYING:
             return
         
-        current_time = pygame.time.get_ticks()
+        self.tick += 1
+        self.sim_time = self.tick * 1000 // TICK_RATE
+        current_time = self.sim_time
         
         # Handle death animation
         if self.death_animation:
@@ -124,6 +260,17 @@ class Game:
                     self.reset_level()
             return
         
+        # Steer Pac-Man, by script or keyboard
+        previous_direction = self.pacman.next_direction
+        if self.policy is not None:
+            direction = self.policy(self)
+            if direction is not None:
+                self.pacman.next_direction = direction
+        elif self._pressed_keys is not None:
+            self.pacman.handle_input(self._pressed_keys)
+        if self.recorder is not None:
+            self.recorder.record(self, previous_direction)
+        
         # Update Pac-Man
         self.pacman.update(self.maze, current_time)
         
@@ -152,22 +299,48 @@ class Game:
         )
         for ghost in ghosts_killed:
             self.score += GHOST_SCORE
+            self.ghosts_killed += 1
         
         # Update ghosts
         for ghost in self.ghosts:
             ghost.update(self.pacman, self.maze, current_time)
             
             # Check collision with Pac-Man
-            if ghost.alive and ghost.collides_with(self.pacman.get_rect()):
+            if ghost.alive and ghost.collides_with_pacman(self.pacman):
                 # Pac-Man dies
                 self.death_animation = True
                 self.death_time = current_time
                 return
     
-    def draw(self):
-        """Draw everything to the screen."""
+    def draw(self, alpha=1.0):
+        """
+        Draw everything to the screen.
+        
+        Moving sprites are drawn alpha (0-1) of the way from their position
+        at the previous tick to the current one. Returns the list of
+        rectangles that changed, or None when the whole screen was redrawn
+        and should be flipped.
+        """
+        if (self.dirty_rect_rendering and self.state == STATE_PLAYING
+                and not self._needs_full_redraw
+                and self._last_drawn_state == STATE_PLAYING):
+            self._interpolate(alpha)
+            return self._draw_game_dirty()
+        
+        if self.state != STATE_PLAYING and not self._needs_full_redraw:
+            # Nothing moves outside of play, so the frame composed when the
+            # state was entered is presented again as-is
+            if self._frozen_state == self.state:
+                if self.dirty_rect_rendering:
+                    return []
+                self.screen.blit(self._frozen_frame, (0, 0))
+                return None
+        
+        self._interpolate(alpha)
+        
         # Clear screen
         self.screen.fill(BG_COLOR)
+        self._profile("draw")
         
         if self.state == STATE_START:
             self._draw_start_screen()
@@ -181,18 +354,127 @@ class Game:
         elif self.state == STATE_WIN:
             self._draw_game()
             self._draw_win_overlay()
+        if self.profiler is not None:
+            self._draw_profiler_overlay()
+        
+        # Everything is on screen now, so pending dirty areas are stale
+        self.maze.pop_dirty_rects()
+        self._prev_draw_rects = self._get_entity_draw_rects()
+        self._hud_values = self._get_hud_values()
+        self._needs_full_redraw = False
+        self._last_drawn_state = self.state
+        if self.state == STATE_PLAYING:
+            self._frozen_state = None
+        else:
+            self._frozen_state = self.state
+            if not self.dirty_rect_rendering:
+                self._frozen_frame = self.screen.copy()
+        self._profile("draw")
+        return None
+    
+    def _interpolate(self, alpha):
+        """Place moving sprites between their last two simulated positions."""
+        if self.death_animation:
+            # Nothing moves during the death freeze, and the previous
+            # positions are not refreshed, so draw where things stopped
+            alpha = 1.0
+        self.pacman.interpolate(alpha)
+        for ghost in self.ghosts:
+            ghost.interpolate(alpha)
+        self.heart_manager.interpolate(alpha)
+    
+    def _get_overlay(self, color, alpha):
+        """Get a (cached) translucent full-screen overlay surface."""
+        key = (color, alpha)
+        overlay = self._overlays.get(key)
+        if overlay is None:
+            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            overlay.fill(color)
+            overlay.set_alpha(alpha)
+            self._overlays[key] = overlay
+        return overlay
+    
+    def _get_entity_draw_rects(self):
+        """Get the screen areas covered by every moving sprite."""
+        rects = self.heart_manager.get_draw_rects()
+        rects.append(self.pacman.get_draw_rect())
+        for sprite in [self.rose_manager] + self.ghosts:
+            rect = sprite.get_draw_rect()
+            if rect is not None:
+                rects.append(rect)
+        if self._profiler_overlay is not None:
+            # Redrawn every frame, like a sprite
+            rects.append(self._profiler_overlay[1].get_rect(
+                bottomleft=(0, SCREEN_HEIGHT)))
+        return rects
+    
+    def _get_hud_values(self):
+        """Get everything the HUD displays, to detect when it changes."""
+        remaining = self.pacman.get_powerup_remaining(self.sim_time)
+        power_seconds = remaining // 1000 + 1 if remaining > 0 else 0
+        return (self.score, self.lives, power_seconds)
+    
+    def _draw_game_dirty(self):
+        """Redraw only the areas that changed since the previous frame."""
+        current_rects = self._get_entity_draw_rects()
+        dirty_rects = (self._prev_draw_rects + current_rects +
+                       self.maze.pop_dirty_rects())
+        
+        self._profile("draw")
+        
+        # Erase last frame's sprites from the maze background
+        self.maze.draw_areas(self.screen, dirty_rects)
+        self._profile("draw_maze")
+        
+        hud_values = self._get_hud_values()
+        if hud_values != self._hud_values:
+            hud_rect = pygame.Rect(0, 0, SCREEN_WIDTH, MAZE_OFFSET_Y)
+            self.screen.fill(BG_COLOR, hud_rect)
+            self._draw_hud()
+            dirty_rects.append(hud_rect)
+            self._hud_values = hud_values
+        self._profile("draw_hud")
+        
+        self.rose_manager.draw(self.screen, self.sim_time)
+        self.heart_manager.draw(self.screen)
+        draw_ghosts(self.screen, self.ghosts, get_wave_phase(self.sim_time))
+        if not self.death_animation:
+            self.pacman.draw(self.screen, self.sim_time)
+        else:
+            self._draw_death_animation()
+        self._profile("draw_sprites")
+        
+        if self.profiler is not None:
+            self._draw_profiler_overlay()
+            self._profile("draw")
+        
+        self._prev_draw_rects = current_rects
+        return dirty_rects
+    
+    def _render_text(self, font, text, color):
+        """Render antialiased text, reusing the surface if seen before."""
+        key = (font, text, color)
+        return self._text_cache.get(key, lambda: font.render(text, True, color))
+    
+    def _render_value(self, slot, font, text, color):
+        """Render text for a changing value, only when the text changes."""
+        cached = self._value_surfaces.get(slot)
+        if cached is None or cached[0] != text:
+            cached = (text, font.render(text, True, color))
+            self._value_surfaces[slot] = cached
+        return cached[1]
     
     def _draw_start_screen(self):
         """Draw the start screen."""
         # Title
         title_text = "PAC-MAN"
-        title_surface = self.font_large.render(title_text, True, WALL_COLOR)
+        title_surface = self._render_text(self.font_large, title_text, WALL_COLOR)
         title_rect = title_surface.get_rect(center=(SCREEN_WIDTH // 2, 150))
         self.screen.blit(title_surface, title_rect)
         
         # Subtitle
         subtitle_text = "Valentine's Special"
-        subtitle_surface = self.font_medium.render(subtitle_text, True, HEART_COLOR)
+        subtitle_surface = self._render_text(self.font_medium, subtitle_text, HEART_COLOR)
         subtitle_rect = subtitle_surface.get_rect(center=(SCREEN_WIDTH // 2, 200))
         self.screen.blit(subtitle_surface, subtitle_rect)
         
@@ -211,7 +493,7 @@ class Game:
         
         y_offset = 320
         for line in instructions:
-            text_surface = self.font_small.render(line, True, TEXT_COLOR)
+            text_surface = self._render_text(self.font_small, line, TEXT_COLOR)
             text_rect = text_surface.get_rect(center=(SCREEN_WIDTH // 2, y_offset))
             self.screen.blit(text_surface, text_rect)
             y_offset += 30
@@ -248,36 +530,66 @@ class Game:
         """Draw the main game elements."""
         # Draw HUD
         self._draw_hud()
+        self._profile("draw_hud")
         
         # Draw maze
         self.maze.draw(self.screen)
+        self._profile("draw_maze")
         
         # Draw rose
-        self.rose_manager.draw(self.screen)
+        self.rose_manager.draw(self.screen, self.sim_time)
         
         # Draw hearts
         self.heart_manager.draw(self.screen)
         
         # Draw ghosts
-        for ghost in self.ghosts:
-            ghost.draw(self.screen)
+        draw_ghosts(self.screen, self.ghosts, get_wave_phase(self.sim_time))
         
         # Draw Pac-Man (unless death animation)
         if not self.death_animation:
-            self.pacman.draw(self.screen)
+            self.pacman.draw(self.screen, self.sim_time)
         else:
             self._draw_death_animation()
+        self._profile("draw_sprites")
+    
+    def _draw_profiler_overlay(self):
+        """Draw the profiler's timing percentiles in the bottom-left corner."""
+        profiler = self.profiler
+        refresh = profiler.frame_count // PROFILER_REFRESH_FRAMES
+        overlay = self._profiler_overlay
+        if overlay is None or overlay[0] != refresh:
+            if self._profiler_font is None:
+                self._profiler_font = pygame.font.Font(None, 18)
+            font = self._profiler_font
+            rows = profiler.summary_rows()
+            line_height = font.get_linesize()
+            label_width, column_width = 90, 48
+            panel = pygame.Surface(
+                (label_width + column_width * (len(rows[0]) - 1) + 8,
+                 line_height * len(rows) + 8))
+            for i, row in enumerate(rows):
+                y = 4 + i * line_height
+                panel.blit(font.render(row[0], True, TEXT_COLOR), (4, y))
+                for j, cell in enumerate(row[1:], 1):
+                    text = font.render(cell, True, TEXT_COLOR)
+                    # Right-aligned columns
+                    x = 4 + label_width + column_width * j - text.get_width()
+                    panel.blit(text, (x, y))
+            self._profiler_overlay = (refresh, panel)
+        panel = self._profiler_overlay[1]
+        self.screen.blit(panel, panel.get_rect(bottomleft=(0, SCREEN_HEIGHT)))
     
     def _draw_hud(self):
         """Draw the heads-up display (score, lives, power-up timer)."""
         # Score
         score_text = f"SCORE: {self.score}"
-        score_surface = self.font_small.render(score_text, True, TEXT_COLOR)
+        score_surface = self._render_value("score", self.font_small,
+                                           score_text, TEXT_COLOR)
         self.screen.blit(score_surface, (10, 10))
         
         # Lives
         lives_text = "LIVES:"
-        lives_surface = self.font_small.render(lives_text, True, TEXT_COLOR)
+        lives_surface = self._render_text(self.font_small, lives_text, TEXT_COLOR)
         self.screen.blit(lives_surface, (SCREEN_WIDTH - 150, 10))
         
         # Draw Pac-Man icons for lives
@@ -286,18 +598,17 @@ class Game:
             pygame.draw.circle(self.screen, (255, 223, 0), (x, 18), 8)
         
         # Power-up timer
-        current_time = pygame.time.get_ticks()
-        remaining = self.pacman.get_powerup_remaining(current_time)
+        remaining = self.pacman.get_powerup_remaining(self.sim_time)
         if remaining > 0:
             timer_text = f"POWER: {remaining // 1000 + 1}s"
-            timer_surface = self.font_small.render(timer_text, True, HEART_COLOR)
+            timer_surface = self._render_value("power", self.font_small,
+                                               timer_text, HEART_COLOR)
             timer_rect = timer_surface.get_rect(center=(SCREEN_WIDTH // 2, 15))
             self.screen.blit(timer_surface, timer_rect)
     
     def _draw_death_animation(self):
         """Draw death animation for Pac-Man."""
-        current_time = pygame.time.get_ticks()
-        progress = (current_time - self.death_time) / self.death_duration
+        progress = (self.sim_time - self.death_time) / self.death_duration
         
         # Shrinking circle
         radius = int(self.pacman.radius * (1 - progress))
@@ -312,65 +623,56 @@ class Game:
     def _draw_pause_overlay(self):
         """Draw pause overlay."""
         # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.fill((0, 0, 0))
-        overlay.set_alpha(128)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self._get_overlay((0, 0, 0), 128), (0, 0))
         
         # Pause text
         pause_text = "PAUSED"
-        pause_surface = self.font_large.render(pause_text, True, TEXT_COLOR)
+        pause_surface = self._render_text(self.font_large, pause_text, TEXT_COLOR)
         pause_rect = pause_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 30))
         self.screen.blit(pause_surface, pause_rect)
         
         # Instructions
         resume_text = "Press P to resume"
-        resume_surface = self.font_small.render(resume_text, True, TEXT_COLOR)
+        resume_surface = self._render_text(self.font_small, resume_text, TEXT_COLOR)
         resume_rect = resume_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20))
         self.screen.blit(resume_surface, resume_rect)
         
         restart_text = "Press R to restart"
-        restart_surface = self.font_small.render(restart_text, True, TEXT_COLOR)
+        restart_surface = self._render_text(self.font_small, restart_text, TEXT_COLOR)
         restart_rect = restart_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
         self.screen.blit(restart_surface, restart_rect)
     
     def _draw_game_over_overlay(self):
         """Draw game over overlay."""
         # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.fill((0, 0, 0))
-        overlay.set_alpha(180)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self._get_overlay((0, 0, 0), 180), (0, 0))
         
         # Game Over text
         game_over_text = "GAME OVER"
-        game_over_surface = self.font_large.render(game_over_text, True, (255, 0, 0))
+        game_over_surface = self._render_text(self.font_large, game_over_text, (255, 0, 0))
         game_over_rect = game_over_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
         self.screen.blit(game_over_surface, game_over_rect)
         
         # Final score
         score_text = f"Final Score: {self.score}"
-        score_surface = self.font_medium.render(score_text, True, TEXT_COLOR)
+        score_surface = self._render_text(self.font_medium, score_text, TEXT_COLOR)
         score_rect = score_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 10))
         self.screen.blit(score_surface, score_rect)
         
         # Restart instruction
         restart_text = "Press SPACE or R to play again"
-        restart_surface = self.font_small.render(restart_text, True, TEXT_COLOR)
+        restart_surface = self._render_text(self.font_small, restart_text, TEXT_COLOR)
         restart_rect = restart_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60))
         self.screen.blit(restart_surface, restart_rect)
     
     def _draw_win_overlay(self):
         """Draw win overlay."""
         # Semi-transparent overlay with pink tint
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.fill((50, 0, 30))
-        overlay.set_alpha(180)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self._get_overlay((50, 0, 30), 180), (0, 0))
         
         # Win text
         win_text = "YOU WIN!"
-        win_surface = self.font_large.render(win_text, True, HEART_COLOR)
+        win_surface = self._render_text(self.font_large, win_text, HEART_COLOR)
         win_rect = win_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 80))
         self.screen.blit(win_surface, win_rect)
         
@@ -381,12 +683,12 @@ class Game:
         
         # Final score
         score_text = f"Final Score: {self.score}"
-        score_surface = self.font_medium.render(score_text, True, TEXT_COLOR)
+        score_surface = self._render_text(self.font_medium, score_text, TEXT_COLOR)
         score_rect = score_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 30))
         self.screen.blit(score_surface, score_rect)
         
         # Restart instruction
         restart_text = "Press SPACE or R to play again"
-        restart_surface = self.font_small.render(restart_text, True, TEXT_COLOR)
+        restart_surface = self._render_text(self.font_small, restart_text, TEXT_COLOR)
         restart_rect = restart_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 80))
         self.screen.blit(restart_surface, restart_rect)
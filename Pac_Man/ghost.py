@@ -7,172 +7,199 @@ import pygame
 import random
 import math
 from config import (
-    TILE_SIZE, MAZE_OFFSET_X, MAZE_OFFSET_Y, GHOST_SPEED,
+    TILE_SIZE, GHOST_SPEED,
     BLINKY_COLOR, PINKY_COLOR, INKY_COLOR, CLYDE_COLOR,
-    GHOST_RESPAWN_TIME, UP, DOWN, LEFT, RIGHT
+    GHOST_RESPAWN_TIME, GHOST_COUNT, SWARM_EXIT_INTERVAL, TICK_MS,
+    UP, DOWN, LEFT, RIGHT, NONE
 )
+from collision import entities_overlap
+from maze import DIRECTION_BITS, MASK_DIRECTIONS, TILE_OPEN
+from sprite_cache import SpriteCache
+from subpixel import (
+    SUBPIXEL, TILE, HALF_TILE, ORIGIN_X, to_subpixels, to_pixels,
+    whole_pixels, tile_center_x, tile_center_y, grid_x_of, grid_y_of
+)
+from timestep import interpolate
+
+# Every pupil direction a ghost sprite can show
+SPRITE_DIRECTIONS = [UP, DOWN, LEFT, RIGHT, NONE]
+WAVE_PHASES = 2
 
 
 class Ghost:
     """Base ghost class with common functionality."""
     
-    def __init__(self, start_grid_x, start_grid_y, color, name):
+    # Sprites shared by all ghosts: (colour, wave phase, direction) -> surface
+    sprite_cache = SpriteCache(max_entries=256)
+    sprite_colors = []  # Colours pre-rendered by register_sprite_variants
+    exit_delay = 0  # Extra wait (ms) in the ghost house, to stagger a swarm
+    
+    def __init__(self, start_grid_x, start_grid_y, color, name, rng=random,
+                 in_house=False):
         self.start_grid_x = start_grid_x
         self.start_grid_y = start_grid_y
+        self.starts_in_house = in_house  # Whether the start is in the house
         self.color = color
         self.name = name
+        self.rng = rng  # The game's random.Random, for reproducible runs
         self.reset()
     
     def reset(self):
         """Reset ghost to starting position."""
-        self.x = MAZE_OFFSET_X + self.start_grid_x * TILE_SIZE + TILE_SIZE // 2
-        self.y = MAZE_OFFSET_Y + self.start_grid_y * TILE_SIZE + TILE_SIZE // 2
-        self.direction = LEFT  # Start moving left (valid from exit position)
-        self.speed = GHOST_SPEED
         self.radius = TILE_SIZE // 2 - 2
+        self.box_size = self.radius * 2  # Collision box, like get_rect()
+        self._move_to(tile_center_x(self.start_grid_x),
+                      tile_center_y(self.start_grid_y))
+        self.prev_x, self.prev_y = self.x, self.y  # Position at the last tick
+        self.draw_x, self.draw_y = self.x, self.y  # Interpolated for drawing
+        self.direction = LEFT  # Start moving left (valid from exit position)
+        self.speed = to_subpixels(GHOST_SPEED)  # Sub-pixel steps per tick
         self.alive = True
         self.respawn_time = 0
-        self.in_ghost_house = self.start_grid_y >= 12 and self.start_grid_y <= 16
-        self.exit_timer = random.randint(0, 3000)  # Stagger ghost exits
+        self.in_ghost_house = self.starts_in_house
+        # Stagger ghost exits
+        self.exit_timer = self.rng.randint(0, 3000) + self.exit_delay
         self.last_grid_x = self.start_grid_x
         self.last_grid_y = self.start_grid_y
         self.made_decision_this_tile = False
     
+    @property
+    def x(self):
+        """Pixel x position of the ghost's centre."""
+        return to_pixels(self.sub_x)
+    
+    @property
+    def y(self):
+        """Pixel y position of the ghost's centre."""
+        return to_pixels(self.sub_y)
+    
+    def _move_to(self, sub_x, sub_y):
+        """Set the position (in sub-pixel steps), tile and collision box."""
+        self.sub_x = sub_x
+        self.sub_y = sub_y
+        self.grid_x = grid_x_of(sub_x)
+        self.grid_y = grid_y_of(sub_y)
+        offset = self.radius * SUBPIXEL
+        self.left = whole_pixels(sub_x - offset)
+        self.top = whole_pixels(sub_y - offset)
+    
     def _get_valid_directions(self, maze):
         """Get list of valid directions the ghost can move."""
-        valid = []
-        opposite = (-self.direction[0], -self.direction[1])
-        current_grid_x = self.get_grid_x()
-        current_grid_y = self.get_grid_y()
+        # Only the direction bits (TILE_OPEN says nothing about neighbours)
+        open_mask = maze.get_neighbour_mask(
+            self.grid_x, self.grid_y, self._get_masks(maze)) & ~TILE_OPEN
         
-        for direction in [UP, DOWN, LEFT, RIGHT]:
-            # Check if the NEXT tile in this direction is walkable
-            next_grid_x = current_grid_x + direction[0]
-            next_grid_y = current_grid_y + direction[1]
-            
-            if self._is_tile_walkable(next_grid_x, next_grid_y, maze):
-                # Ghosts prefer not to reverse direction unless it's the only option
-                if direction != opposite:
-                    valid.append(direction)
+        # Ghosts prefer not to reverse direction unless it's the only option
+        opposite = (-self.direction[0], -self.direction[1])
+        forward_mask = open_mask & ~DIRECTION_BITS.get(opposite, 0)
+        if forward_mask:
+            return MASK_DIRECTIONS[forward_mask]
         
         # If no valid non-reverse directions, allow reversing
-        if not valid:
-            for direction in [UP, DOWN, LEFT, RIGHT]:
-                next_grid_x = current_grid_x + direction[0]
-                next_grid_y = current_grid_y + direction[1]
-                if self._is_tile_walkable(next_grid_x, next_grid_y, maze):
-                    valid.append(direction)
-        
-        return valid if valid else [self.direction]
+        return MASK_DIRECTIONS[open_mask] if open_mask else [self.direction]
     
-    def _is_tile_walkable(self, grid_x, grid_y, maze):
-        """Check if a tile is walkable for this ghost."""
-        cell = maze.get_cell(grid_x, grid_y)
-        
-        # Walls are never walkable
-        if cell == 1:
-            return False
-        
-        # Ghosts inside ghost house can move within it
+    def _get_masks(self, maze):
+        """Get the maze's neighbour masks for where this ghost is."""
+        # Ghosts inside the ghost house can move within it, but ghosts
+        # outside cannot re-enter it
         if self.in_ghost_house:
-            return True
-        
-        # Ghosts outside cannot re-enter ghost house (cell value 3)
-        if cell == 3:
-            return False
-        
-        return True
+            return maze.ghost_house_masks
+        return maze.ghost_masks
     
     def _can_move(self, direction, maze):
         """Check if ghost can move in a given direction (for actual movement)."""
-        # Check the next tile
-        next_grid_x = self.get_grid_x() + direction[0]
-        next_grid_y = self.get_grid_y() + direction[1]
-        
         # But also need to handle being at tile boundaries
         # If we're near edge of current tile, check the adjacent tile
-        tile_center_x = MAZE_OFFSET_X + self.get_grid_x() * TILE_SIZE + TILE_SIZE // 2
-        tile_center_y = MAZE_OFFSET_Y + self.get_grid_y() * TILE_SIZE + TILE_SIZE // 2
+        center_x = tile_center_x(self.grid_x)
+        center_y = tile_center_y(self.grid_y)
         
         # If moving away from center, check next tile
         moving_away_x = direction[0] != 0 and (
-            (direction[0] > 0 and self.x >= tile_center_x - 1) or
-            (direction[0] < 0 and self.x <= tile_center_x + 1)
+            (direction[0] > 0 and self.sub_x >= center_x - SUBPIXEL) or
+            (direction[0] < 0 and self.sub_x <= center_x + SUBPIXEL)
         )
         moving_away_y = direction[1] != 0 and (
-            (direction[1] > 0 and self.y >= tile_center_y - 1) or
-            (direction[1] < 0 and self.y <= tile_center_y + 1)
+            (direction[1] > 0 and self.sub_y >= center_y - SUBPIXEL) or
+            (direction[1] < 0 and self.sub_y <= center_y + SUBPIXEL)
         )
         
         if moving_away_x or moving_away_y:
-            return self._is_tile_walkable(next_grid_x, next_grid_y, maze)
+            open_mask = maze.get_neighbour_mask(
+                self.grid_x, self.grid_y, self._get_masks(maze))
+            return bool(open_mask & DIRECTION_BITS[direction])
         
         return True
     
     def _is_aligned_with_grid(self):
         """Check if ghost is aligned with the tile grid."""
-        tile_center_x = MAZE_OFFSET_X + (self.get_grid_x() * TILE_SIZE) + TILE_SIZE // 2
-        tile_center_y = MAZE_OFFSET_Y + (self.get_grid_y() * TILE_SIZE) + TILE_SIZE // 2
-        
-        tolerance = self.speed + 1
-        return (abs(self.x - tile_center_x) <= tolerance and 
-                abs(self.y - tile_center_y) <= tolerance)
+        tolerance = self.speed + SUBPIXEL
+        return (abs(self.sub_x - tile_center_x(self.grid_x)) <= tolerance and 
+                abs(self.sub_y - tile_center_y(self.grid_y)) <= tolerance)
     
     def _snap_to_grid(self):
         """Snap ghost to the nearest grid center."""
-        self.x = MAZE_OFFSET_X + (self.get_grid_x() * TILE_SIZE) + TILE_SIZE // 2
-        self.y = MAZE_OFFSET_Y + (self.get_grid_y() * TILE_SIZE) + TILE_SIZE // 2
+        self._move_to(tile_center_x(self.grid_x), tile_center_y(self.grid_y))
     
     def get_target(self, pacman, maze):
         """Get target position for this ghost. Override in subclasses."""
-        return (pacman.get_grid_x(), pacman.get_grid_y())
+        return (pacman.grid_x, pacman.grid_y)
     
     def _choose_direction(self, target_x, target_y, maze):
-        """Choose direction that moves closest to target."""
+        """Choose the direction with the shortest path to the target."""
         valid_directions = self._get_valid_directions(maze)
         
         if not valid_directions:
             return self.direction
         
+        # Shared with every other ghost after the same tile (targets inside
+        # walls head for the closest path tile)
+        field = maze.get_flow_field(target_x, target_y)
+        
         best_direction = valid_directions[0]
         best_distance = float('inf')
         
         for direction in valid_directions:
-            new_x = self.get_grid_x() + direction[0]
-            new_y = self.get_grid_y() + direction[1]
-            distance = (new_x - target_x) ** 2 + (new_y - target_y) ** 2
-            
-            if distance < best_distance:
-                best_distance = distance
+            tile = maze.path_tile(self.grid_x + direction[0],
+                                  self.grid_y + direction[1])
+            if tile >= 0 and field[tile] < best_distance:
+                best_distance = field[tile]
                 best_direction = direction
         
         return best_direction
     
     def update(self, pacman, maze, current_time):
         """Update ghost position and state."""
+        self.prev_x, self.prev_y = self.x, self.y
+        
         if not self.alive:
             # Check if ready to respawn
             if current_time - self.respawn_time > GHOST_RESPAWN_TIME:
                 self.alive = True
-                self.x = MAZE_OFFSET_X + 13 * TILE_SIZE + TILE_SIZE // 2
-                self.y = MAZE_OFFSET_Y + 14 * TILE_SIZE + TILE_SIZE // 2
+                respawn_x, respawn_y = maze.get_ghost_respawn()
+                self._move_to(tile_center_x(respawn_x),
+                              tile_center_y(respawn_y))
                 self.in_ghost_house = True
                 self.exit_timer = 500
             return
         
         # Handle ghost house exit
         if self.in_ghost_house:
-            self.exit_timer -= 16  # Approximate frame time
+            self.exit_timer -= TICK_MS
             if self.exit_timer <= 0:
                 # Move towards exit
                 exit_x, exit_y = maze.get_ghost_house_exit()
-                exit_px = MAZE_OFFSET_X + exit_x * TILE_SIZE + TILE_SIZE // 2
-                exit_py = MAZE_OFFSET_Y + exit_y * TILE_SIZE + TILE_SIZE // 2
+                exit_sub_x = tile_center_x(exit_x)
+                exit_sub_y = tile_center_y(exit_y)
                 
-                if abs(self.x - exit_px) > self.speed:
-                    self.x += self.speed if self.x < exit_px else -self.speed
-                elif abs(self.y - exit_py) > self.speed:
-                    self.y += self.speed if self.y < exit_py else -self.speed
+                step = self.speed
+                if abs(self.sub_x - exit_sub_x) > step:
+                    if self.sub_x > exit_sub_x:
+                        step = -step
+                    self._move_to(self.sub_x + step, self.sub_y)
+                elif abs(self.sub_y - exit_sub_y) > step:
+                    if self.sub_y > exit_sub_y:
+                        step = -step
+                    self._move_to(self.sub_x, self.sub_y + step)
                 else:
                     self.in_ghost_house = False
                     # Start moving left (there's a valid path to the left from exit)
@@ -183,8 +210,8 @@ class Ghost:
             return
         
         # Check if we've entered a new tile
-        current_grid_x = self.get_grid_x()
-        current_grid_y = self.get_grid_y()
+        current_grid_x = self.grid_x
+        current_grid_y = self.grid_y
         entered_new_tile = (current_grid_x != self.last_grid_x or 
                            current_grid_y != self.last_grid_y)
         
@@ -203,23 +230,34 @@ class Ghost:
             self.made_decision_this_tile = True
         
         # Move in current direction
-        if self._can_move(self.direction, maze):
-            self.x += self.direction[0] * self.speed
-            self.y += self.direction[1] * self.speed
-        else:
+        moving = self._can_move(self.direction, maze)
+        if not moving:
             # Current direction blocked - find ANY valid direction
-            for try_dir in [UP, DOWN, LEFT, RIGHT]:
+            for try_dir in (UP, DOWN, LEFT, RIGHT):
                 if self._can_move(try_dir, maze):
                     self.direction = try_dir
-                    self.x += self.direction[0] * self.speed
-                    self.y += self.direction[1] * self.speed
+                    moving = True
                     break
-            
+        sub_x, sub_y = self.sub_x, self.sub_y
+        if moving:
+            sub_x += self.direction[0] * self.speed
+            sub_y += self.direction[1] * self.speed
+        
         # Handle tunnel wrap-around
-        if self.x < MAZE_OFFSET_X:
-            self.x = MAZE_OFFSET_X + maze.width * TILE_SIZE - TILE_SIZE // 2
-        elif self.x > MAZE_OFFSET_X + maze.width * TILE_SIZE:
-            self.x = MAZE_OFFSET_X + TILE_SIZE // 2
+        if sub_x < ORIGIN_X:
+            sub_x = ORIGIN_X + maze.width * TILE - HALF_TILE
+        elif sub_x > ORIGIN_X + maze.width * TILE:
+            sub_x = ORIGIN_X + HALF_TILE
+        self._move_to(sub_x, sub_y)
+    
+    def place(self, grid_x, grid_y):
+        """Put the ghost straight onto a tile outside the ghost house."""
+        self._move_to(tile_center_x(grid_x), tile_center_y(grid_y))
+        self.prev_x, self.prev_y = self.x, self.y
+        self.in_ghost_house = False
+        self.last_grid_x = grid_x
+        self.last_grid_y = grid_y
+        self.made_decision_this_tile = False
     
     def kill(self, current_time):
         """Kill the ghost."""
@@ -228,96 +266,151 @@ class Ghost:
     
     def get_grid_x(self):
         """Get current grid X position."""
-        return int((self.x - MAZE_OFFSET_X) // TILE_SIZE)
+        return self.grid_x
     
     def get_grid_y(self):
         """Get current grid Y position."""
-        return int((self.y - MAZE_OFFSET_Y) // TILE_SIZE)
+        return self.grid_y
     
     def get_rect(self):
-        """Get ghost's collision rectangle."""
-        return pygame.Rect(
-            self.x - self.radius,
-            self.y - self.radius,
-            self.radius * 2,
-            self.radius * 2
-        )
+        """Get ghost's collision rectangle (a new Rect)."""
+        return pygame.Rect(self.left, self.top, self.box_size, self.box_size)
     
     def collides_with(self, other_rect):
         """Check collision with another rectangle."""
         return self.get_rect().colliderect(other_rect)
     
-    def draw(self, screen):
-        """Draw the ghost on the screen."""
+    def collides_with_pacman(self, pacman):
+        """Check collision with Pac-Man (without building Rects)."""
+        return entities_overlap(self, pacman)
+    
+    def interpolate(self, alpha):
+        """Set the position to draw at, alpha of the way through this tick."""
+        self.draw_x = interpolate(self.prev_x, self.x, alpha)
+        self.draw_y = interpolate(self.prev_y, self.y, alpha)
+    
+    def get_draw_rect(self):
+        """Get the screen area covered by the ghost's sprite."""
         if not self.alive:
-            return
-        
-        x, y = int(self.x), int(self.y)
+            return None
         r = self.radius
-        
-        # Ghost body (rounded top, wavy bottom)
-        # Top semicircle
-        pygame.draw.circle(screen, self.color, (x, y - 2), r)
-        
-        # Body rectangle
-        pygame.draw.rect(screen, self.color, 
-                        (x - r, y - 2, r * 2, r))
-        
-        # Wavy bottom
-        wave_offset = (pygame.time.get_ticks() // 100) % 2
-        for i in range(3):
-            wave_x = x - r + (i * 2 * r // 3) + r // 3
-            wave_y = y + r - 4
-            wave_r = r // 3
-            if (i + wave_offset) % 2 == 0:
-                pygame.draw.circle(screen, self.color, (wave_x, wave_y), wave_r)
-        
-        # Eyes
-        eye_offset = 4
-        eye_radius = 4
-        pupil_radius = 2
-        
-        # Eye direction based on movement
-        pupil_offset_x = self.direction[0] * 2
-        pupil_offset_y = self.direction[1] * 2
-        
-        # Left eye
-        pygame.draw.circle(screen, (255, 255, 255), 
-                          (x - eye_offset, y - 4), eye_radius)
-        pygame.draw.circle(screen, (0, 0, 200), 
-                          (x - eye_offset + pupil_offset_x, 
-                           y - 4 + pupil_offset_y), pupil_radius)
-        
-        # Right eye
-        pygame.draw.circle(screen, (255, 255, 255), 
-                          (x + eye_offset, y - 4), eye_radius)
-        pygame.draw.circle(screen, (0, 0, 200), 
-                          (x + eye_offset + pupil_offset_x, 
-                           y - 4 + pupil_offset_y), pupil_radius)
+        return pygame.Rect(int(self.draw_x) - r - 1, int(self.draw_y) - r - 3,
+                           r * 2 + 3, r * 2 + 5)
+    
+    @classmethod
+    def register_sprite_variants(cls, radius=TILE_SIZE // 2 - 2):
+        """Pre-render every wave phase and eye direction for sprite_colors."""
+        Ghost.sprite_cache.set_scale(radius)
+        for color in cls.sprite_colors:
+            for wave_phase in range(WAVE_PHASES):
+                for direction in SPRITE_DIRECTIONS:
+                    key = (color, wave_phase, direction)
+                    Ghost.sprite_cache.get(
+                        key, lambda: render_ghost_sprite(radius, *key))
+    
+    def get_sprite(self, wave_phase):
+        """Get the (cached) sprite and where to blit it for this frame."""
+        r = self.radius
+        Ghost.sprite_cache.set_scale(r)
+        key = (self.color, wave_phase, self.direction)
+        sprite = Ghost.sprite_cache.get(
+            key, lambda: render_ghost_sprite(r, *key))
+        return sprite, (int(self.draw_x) - r - 1, int(self.draw_y) - r - 3)
+    
+    def draw(self, screen, wave_phase):
+        """Draw the ghost on the screen (wave_phase from get_wave_phase)."""
+        if not self.alive:
+            return
+        screen.blit(*self.get_sprite(wave_phase))
+
+
+def get_wave_phase(current_time):
+    """Get which of the two wavy-bottom frames ghosts show at a time."""
+    return (current_time // 100) % WAVE_PHASES
+
+
+def draw_ghosts(screen, ghosts, wave_phase):
+    """Draw every living ghost with one batched blit call."""
+    screen.blits([ghost.get_sprite(wave_phase)
+                  for ghost in ghosts if ghost.alive], doreturn=False)
+
+
+def render_ghost_sprite(r, color, wave_phase, direction):
+    """Render a ghost body with eyes onto its own surface."""
+    surface = pygame.Surface((r * 2 + 3, r * 2 + 5), pygame.SRCALPHA)
+    x, y = r + 1, r + 3  # Ghost centre on the sprite surface
+    
+    # Ghost body (rounded top, wavy bottom)
+    # Top semicircle
+    pygame.draw.circle(surface, color, (x, y - 2), r)
+    
+    # Body rectangle
+    pygame.draw.rect(surface, color, 
+                    (x - r, y - 2, r * 2, r))
+    
+    # Wavy bottom
+    for i in range(3):
+        wave_x = x - r + (i * 2 * r // 3) + r // 3
+        wave_y = y + r - 4
+        wave_r = r // 3
+        if (i + wave_phase) % 2 == 0:
+            pygame.draw.circle(surface, color, (wave_x, wave_y), wave_r)
+    
+    # Eyes
+    eye_offset = 4
+    eye_radius = 4
+    pupil_radius = 2
+    
+    # Eye direction based on movement
+    pupil_offset_x = direction[0] * 2
+    pupil_offset_y = direction[1] * 2
+    
+    # Left eye
+    pygame.draw.circle(surface, (255, 255, 255), 
+                      (x - eye_offset, y - 4), eye_radius)
+    pygame.draw.circle(surface, (0, 0, 200), 
+                      (x - eye_offset + pupil_offset_x, 
+                       y - 4 + pupil_offset_y), pupil_radius)
+    
+    # Right eye
+    pygame.draw.circle(surface, (255, 255, 255), 
+                      (x + eye_offset, y - 4), eye_radius)
+    pygame.draw.circle(surface, (0, 0, 200), 
+                      (x + eye_offset + pupil_offset_x, 
+                       y - 4 + pupil_offset_y), pupil_radius)
+    
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+    return surface
 
 
 class Blinky(Ghost):
     """Red ghost - Direct chaser, always targets Pac-Man's position."""
     
-    def __init__(self, start_grid_x, start_grid_y):
-        super().__init__(start_grid_x, start_grid_y, BLINKY_COLOR, "Blinky")
-        self.in_ghost_house = False  # Blinky starts outside
+    sprite_colors = [BLINKY_COLOR]
+    
+    def __init__(self, start_grid_x, start_grid_y, rng=random, in_house=False):
+        super().__init__(start_grid_x, start_grid_y, BLINKY_COLOR, "Blinky",
+                         rng, in_house)
     
     def get_target(self, pacman, maze):
         """Direct chase - target Pac-Man's current position."""
-        return (pacman.get_grid_x(), pacman.get_grid_y())
+        return (pacman.grid_x, pacman.grid_y)
 
 
 class Pinky(Ghost):
     """Pink ghost - Ambusher, targets 4 tiles ahead of Pac-Man."""
     
-    def __init__(self, start_grid_x, start_grid_y):
-        super().__init__(start_grid_x, start_grid_y, PINKY_COLOR, "Pinky")
+    sprite_colors = [PINKY_COLOR]
+    
+    def __init__(self, start_grid_x, start_grid_y, rng=random, in_house=False):
+        super().__init__(start_grid_x, start_grid_y, PINKY_COLOR, "Pinky",
+                         rng, in_house)
     
     def get_target(self, pacman, maze):
         """Ambush - target 4 tiles ahead of Pac-Man."""
-        target_x = pacman.get_grid_x() + pacman.facing_direction[0] * 4
-        target_y = pacman.get_grid_y() + pacman.facing_direction[1] * 4
+        target_x = pacman.grid_x + pacman.facing_direction[0] * 4
+        target_y = pacman.grid_y + pacman.facing_direction[1] * 4
         
         # Clamp to maze bounds
         target_x = max(0, min(maze.width - 1, target_x))
@@ -329,22 +422,26 @@ class Pinky(Ghost):
 class Inky(Ghost):
     """Cyan ghost - Unpredictable, uses Blinky's position for targeting."""
     
-    def __init__(self, start_grid_x, start_grid_y, blinky=None):
-        super().__init__(start_grid_x, start_grid_y, INKY_COLOR, "Inky")
+    sprite_colors = [INKY_COLOR]
+    
+    def __init__(self, start_grid_x, start_grid_y, blinky=None, rng=random,
+                 in_house=False):
+        super().__init__(start_grid_x, start_grid_y, INKY_COLOR, "Inky", rng,
+                         in_house)
         self.blinky = blinky
     
     def get_target(self, pacman, maze):
         """Flanking behavior using Blinky's position."""
         if self.blinky is None:
-            return (pacman.get_grid_x(), pacman.get_grid_y())
+            return (pacman.grid_x, pacman.grid_y)
         
         # Get position 2 tiles ahead of Pac-Man
-        ahead_x = pacman.get_grid_x() + pacman.facing_direction[0] * 2
-        ahead_y = pacman.get_grid_y() + pacman.facing_direction[1] * 2
+        ahead_x = pacman.grid_x + pacman.facing_direction[0] * 2
+        ahead_y = pacman.grid_y + pacman.facing_direction[1] * 2
         
         # Vector from Blinky to that position, doubled
-        target_x = ahead_x + (ahead_x - self.blinky.get_grid_x())
-        target_y = ahead_y + (ahead_y - self.blinky.get_grid_y())
+        target_x = ahead_x + (ahead_x - self.blinky.grid_x)
+        target_y = ahead_y + (ahead_y - self.blinky.grid_y)
         
         # Clamp to maze bounds
         target_x = max(0, min(maze.width - 1, target_x))
@@ -356,31 +453,61 @@ class Inky(Ghost):
 class Clyde(Ghost):
     """Orange ghost - Shy, chases when far but scatters when close."""
     
-    def __init__(self, start_grid_x, start_grid_y):
-        super().__init__(start_grid_x, start_grid_y, CLYDE_COLOR, "Clyde")
+    sprite_colors = [CLYDE_COLOR]
+    
+    def __init__(self, start_grid_x, start_grid_y, rng=random, in_house=False):
+        super().__init__(start_grid_x, start_grid_y, CLYDE_COLOR, "Clyde",
+                         rng, in_house)
     
     def get_target(self, pacman, maze):
         """Chase when far (>8 tiles), scatter to corner when close."""
         distance = math.sqrt(
-            (self.get_grid_x() - pacman.get_grid_x()) ** 2 +
-            (self.get_grid_y() - pacman.get_grid_y()) ** 2
+            (self.grid_x - pacman.grid_x) ** 2 +
+            (self.grid_y - pacman.grid_y) ** 2
         )
         
         if distance > 8:
             # Chase Pac-Man
-            return (pacman.get_grid_x(), pacman.get_grid_y())
+            return (pacman.grid_x, pacman.grid_y)
         else:
             # Scatter to bottom-left corner
             return (1, maze.height - 2)
 
 
-def create_ghosts(maze):
-    """Create all four ghosts at their starting positions."""
+def create_ghosts(maze, rng=random, count=GHOST_COUNT):
+    """
+    Create count ghosts at their starting positions.
+    
+    The first four are Blinky, Pinky, Inky and Clyde as usual. Any more
+    make a swarm: the four types again and again, every one starting in
+    the ghost house and leaving it SWARM_EXIT_INTERVAL after the one
+    before, each Inky flanking with the Blinky of its own group of four.
+    """
     positions = maze.get_ghost_start_positions()
+    house_positions = positions[1:]
     
-    blinky = Blinky(positions[0][0], positions[0][1])
-    pinky = Pinky(positions[1][0], positions[1][1])
-    inky = Inky(positions[2][0], positions[2][1], blinky)
-    clyde = Clyde(positions[3][0], positions[3][1])
+    ghosts = []
+    blinky = None
+    for i in range(count):
+        kind = i % 4
+        if i < 4:
+            x, y = positions[kind]
+        else:
+            x, y = house_positions[i % len(house_positions)]
+        
+        in_house = maze.is_ghost_house(x, y)
+        if kind == 0:
+            ghost = blinky = Blinky(x, y, rng, in_house)
+        elif kind == 1:
+            ghost = Pinky(x, y, rng, in_house)
+        elif kind == 2:
+            ghost = Inky(x, y, blinky, rng, in_house)
+        else:
+            ghost = Clyde(x, y, rng, in_house)
+        
+        if i >= 4:
+            ghost.exit_delay = (i - 3) * SWARM_EXIT_INTERVAL
+            ghost.exit_timer += ghost.exit_delay
+        ghosts.append(ghost)
     
-    return [blinky, pinky, inky, clyde]
+    return ghosts
@@ -0,0 +1,67 @@
+"""
+Headless fast-forward simulation for Valentine's Pac-Man game.
+Runs the game logic without a display, as fast as the CPU allows,
+with Pac-Man steered by a policy callback instead of the keyboard.
+
+Usage:
+    python headless.py [--ticks N] [--seed S]
+"""
+
+import argparse
+import random
+import time
+
+from config import (
+    TICK_RATE, STATE_PLAYING, UP, DOWN, LEFT, RIGHT
+)
+from game import Game
+
+
+def random_policy(rng, turn_interval=30):
+    """Make a policy that picks a random direction every turn_interval ticks."""
+    directions = [UP, DOWN, LEFT, RIGHT]
+    
+    def policy(game):
+        if game.tick % turn_interval == 1:
+            return rng.choice(directions)
+        return None
+    
+    return policy
+
+
+def run_headless(game, max_ticks, seed=None):
+    """
+    Play a game from the start until it ends or max_ticks have passed.
+    
+    seed is passed on to game.reset_game. Returns the number of ticks
+    simulated.
+    """
+    game.reset_game(seed)
+    ticks = 0
+    while game.state == STATE_PLAYING and ticks < max_ticks:
+        game.update()
+        ticks += 1
+    return ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ticks", type=int, default=TICK_RATE * 600,
+                        help="maximum ticks to simulate")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed for the game and the random policy")
+    args = parser.parse_args()
+    
+    game = Game(None, policy=random_policy(random.Random(args.seed)),
+                seed=args.seed)
+    start = time.perf_counter()
+    ticks = run_headless(game, args.ticks)
+    elapsed = time.perf_counter() - start
+    
+    print(f"{ticks} ticks ({ticks / TICK_RATE:.0f}s of play) "
+          f"in {elapsed:.2f}s = {ticks / elapsed:.0f} ticks/s")
+    print(f"state: {game.state}, score: {game.score}, lives: {game.lives}")
+
+
+if __name__ == "__main__":
+    main()
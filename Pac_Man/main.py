@@ -11,22 +11,43 @@ Controls:
 - P or ESC: Pause game
 - R: Restart game
 - SPACE: Start game / Restart after game over
+- F3: Toggle the frame profiler and its timing overlay
+- F4: Save the profiler's timings (CSV and Chrome trace JSON)
+- F9: Save a replay of the game so far (see replay.py)
+- ] / [: Add or remove ghosts (a swarm of them; restarts the game)
+
+Run python main.py --ghosts N to play against N ghosts; the window title
+then shows the most ghosts that have held the frame rate (see swarm.py).
 
 This file is compatible with both:
 - Standard pygame (python main.py)
 - pygbag for browser deployment (pygbag main.py)
 """
 
+import argparse
 import asyncio
 import sys
 import pygame
 
+CAPTION = "Pac-Man: Valentine's Special"
+
 
 async def main():
     """Main game loop."""
     # Import config after pygame is ready
-    from config import SCREEN_WIDTH, SCREEN_HEIGHT, FPS
+    from config import (
+        SCREEN_WIDTH, SCREEN_HEIGHT, FPS, TICK_RATE, MAX_TICKS_PER_FRAME,
+        GHOST_COUNT, STATE_PLAYING
+    )
     from game import Game
+    from replay import InputRecorder
+    from swarm import SwarmCounter
+    from timestep import FixedTimestep
+    
+    parser = argparse.ArgumentParser(description="Valentine's Pac-Man")
+    parser.add_argument("--ghosts", type=int, default=GHOST_COUNT,
+                        help="number of ghosts (more than 4 is a swarm)")
+    args, _ = parser.parse_known_args()  # pygbag may pass its own
     
     # Initialize pygame
     pygame.init()
@@ -39,36 +60,71 @@ async def main():
     
     # Set up display
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption("Pac-Man: Valentine's Special")
+    pygame.display.set_caption(CAPTION)
     
-    # Set up clock for frame rate
+    # Set up clock for frame rate, and fixed ticks for the simulation
     clock = pygame.time.Clock()
+    timestep = FixedTimestep(TICK_RATE, MAX_TICKS_PER_FRAME)
+    frame_ms = 0
     
     # Create game instance
-    game = Game(screen)
+    game = Game(screen, ghost_count=args.ghosts)
+    game.recorder = InputRecorder()
     
-    # Main game loop
+    # Frame rate held by each ghost count, shown in the title; only
+    # counted once ghosts are added (in play, so menus don't count)
+    swarm_counter = None
+    
+    # Main game loop (timed phase by phase while the profiler is on)
     while game.running:
+        profiler = game.profiler
+        if profiler is not None:
+            profiler.begin_frame()
+        
         # Handle events
         game.handle_events()
+        if profiler is not None:
+            profiler.mark("events")
         
-        # Update game state
-        game.update()
+        # Update game state in fixed ticks for the time that has passed
+        for _ in range(timestep.advance(frame_ms)):
+            game.update()
+        if profiler is not None:
+            profiler.mark("update")
         
-        # Draw everything
-        game.draw()
+        # Draw everything, interpolated between the last two ticks
+        dirty_rects = game.draw(timestep.alpha)
         
-        # Update display
-        pygame.display.flip()
+        # Update display (only the changed areas when the game reports them)
+        if dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty_rects)
+        if profiler is not None:
+            profiler.mark("present")
         
         # Control frame rate
-        clock.tick(FPS)
+        frame_ms = clock.tick(FPS)
+        if profiler is not None:
+            profiler.mark("wait")
+            profiler.end_frame()
+        
+        if len(game.ghosts) != GHOST_COUNT and swarm_counter is None:
+            swarm_counter = SwarmCounter()
+        if swarm_counter is not None and game.state == STATE_PLAYING:
+            if swarm_counter.frame(len(game.ghosts), frame_ms) is not None:
+                pygame.display.set_caption(
+                    f"{CAPTION} - {len(game.ghosts)} ghosts, most at "
+                    f"{FPS} FPS: {swarm_counter.max_sustained}")
         
         # Required for pygbag (web browser compatibility)
         # This yields control back to the browser event loop
         await asyncio.sleep(0)
     
     # Clean up
+    if swarm_counter is not None:
+        print(f"Most ghosts holding {FPS} FPS: "
+              f"{swarm_counter.max_sustained}")
     pygame.quit()
 
 
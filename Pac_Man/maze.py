@@ -3,10 +3,16 @@ Maze system for Valentine's Pac-Man game.
 Handles maze layout, rendering, and collision detection.
 """
 
+import hashlib
+import os
+import tempfile
+from array import array
+from collections import OrderedDict
+
 import pygame
 from config import (
     TILE_SIZE, MAZE_OFFSET_X, MAZE_OFFSET_Y,
-    WALL_COLOR, PATH_COLOR, DOT_COLOR
+    WALL_COLOR, PATH_COLOR, DOT_COLOR, BG_COLOR, UP, DOWN, LEFT, RIGHT
 )
 
 # Maze layout:
@@ -16,6 +22,26 @@ from config import (
 # 3 = ghost house
 # 4 = ghost house door
 
+# Path distances between tiles are cached here, one file per layout
+DISTANCE_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache",
+                                  "valentine-pacman")
+# Part of every cache key; bump it whenever the path graph or the table
+# format changes, so old files are never read back
+DISTANCE_CACHE_VERSION = 1
+UNREACHABLE = 0xFFFF  # Distance table entry for tiles with no path between
+FLOW_FIELD_CACHE_SIZE = 16  # Targets whose flow fields each maze keeps
+
+# Neighbour mask bits: the directions a walker can step in from a tile,
+# plus whether it can stand on the tile at all
+DIRECTION_BITS = {UP: 1, DOWN: 2, LEFT: 4, RIGHT: 8}
+TILE_OPEN = 16
+# The directions in each mask, in UP/DOWN/LEFT/RIGHT order (shared lists,
+# not to be modified)
+MASK_DIRECTIONS = [
+    [direction for direction, bit in DIRECTION_BITS.items() if mask & bit]
+    for mask in range(32)
+]
+
 MAZE_LAYOUT = [
     [1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1],
     [1,0,0,0,0,0,0,0,0,0,0,0,0,1,1,0,0,0,0,0,0,0,0,0,0,0,0,1],
@@ -50,53 +76,291 @@ MAZE_LAYOUT = [
     [1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1],
 ]
 
+# The default layout as Maze stores it (see Maze.__init__)
+DEFAULT_CELLS = bytes(cell for row in MAZE_LAYOUT for cell in row)
+
 
 class Maze:
     """Handles maze layout, rendering, and collision detection."""
     
-    def __init__(self):
-        self.layout = [row[:] for row in MAZE_LAYOUT]  # Deep copy
-        self.width = len(self.layout[0])
-        self.height = len(self.layout)
-        self.dots_remaining = self._count_dots()
-        self.total_dots = self.dots_remaining
-        
-    def _count_dots(self):
-        """Count total number of dots in the maze."""
-        count = 0
-        for row in self.layout:
-            for cell in row:
-                if cell == 0:
-                    count += 1
-        return count
+    # Pre-rendered walls/paths, per layout (built on first draw)
+    _static_surfaces = {}
+    
+    # Everything that only depends on the layout, built once per layout and
+    # shared by every maze using it: (width, cells) -> _build_shared_layout()
+    _shared_layouts = {}
+    
+    # Path tile graphs and distance tables already built, by layout key
+    _path_graphs = {}
+    _distance_tables = {}
+    
+    def __init__(self, layout=None, spawn_exclusions=None):
+        """
+        Create a maze from layout (rows of cell values, see MAZE_LAYOUT).
+        
+        The layout itself is kept as one read-only bytes object (cells,
+        row-major) shared with every other maze on the same layout; each
+        maze only owns a bitset of which dots are left.
+        
+        spawn_exclusions lists (x1, y1, x2, y2) grid boxes (inclusive) where
+        power-ups must not spawn; by default the ghost house's bounding box.
+        Start positions, the ghost house exit and the ghost respawn point
+        are all worked out from the layout (see _find_positions).
+        """
+        if layout is None:
+            self.cells, self.width = DEFAULT_CELLS, len(MAZE_LAYOUT[0])
+        else:
+            self.cells = bytes(cell for row in layout for cell in row)
+            self.width = len(layout[0])
+        self.height = len(self.cells) // self.width
+        
+        self._layout = (self.width, self.cells)  # Bytes cache their hash
+        if spawn_exclusions is not None:
+            spawn_exclusions = tuple(spawn_exclusions)
+        key = self._layout + (spawn_exclusions,)
+        if key not in Maze._shared_layouts:
+            Maze._shared_layouts[key] = self._build_shared_layout(
+                spawn_exclusions)
+        (self.cells, self.tunnel_rows, self.pacman_masks, self.ghost_masks,
+         self.ghost_house_masks, self._all_dots, self.spawn_exclusions,
+         self.spawn_positions, self._positions) = Maze._shared_layouts[key]
+        
+        # Path data, built on first query (and shared by equal layouts)
+        self._graph = None
+        self._distances = None
+        self._flow_fields = OrderedDict()  # Target path tile -> distances
+        
+        # Dot state: bit (i & 7) of dots[i >> 3] is set while cell i
+        # (y * width + x) still has its dot
+        self.dots = bytearray(self._all_dots)
+        self.total_dots = int.from_bytes(self._all_dots, "little").bit_count()
+        self.dots_remaining = self.total_dots
+        self._dot_layer = None  # Remaining dots, built lazily on first draw
+        self._dirty_rects = []  # Screen areas changed since the last draw
+    
+    @classmethod
+    def clear_layout_caches(cls):
+        """
+        Forget the data shared per layout (rebuilt when next needed).
+        
+        Mazes already made keep theirs; this only frees what no maze uses
+        any more, which matters after building very large mazes.
+        """
+        cls._static_surfaces.clear()
+        cls._shared_layouts.clear()
+        cls._path_graphs.clear()
+        cls._distance_tables.clear()
+    
+    def _build_shared_layout(self, spawn_exclusions):
+        """Work out the layout-only data that mazes share."""
+        # Rows open at both ends, where walking off one side wraps around
+        last = self.width - 1
+        self.tunnel_rows = frozenset(
+            y for y in range(self.height)
+            if self.cells[y * self.width] != 1
+            and self.cells[y * self.width + last] != 1
+        )
+        
+        # Neighbour masks per cell (y * width + x). Eating dots never changes
+        # what is walkable, so these only need building with the layout.
+        # Pac-Man and ghosts outside the house are blocked by the same
+        # cells, so they share one (read-only) table.
+        pacman_masks = ghost_masks = self._build_neighbour_masks((1, 3))
+        ghost_house_masks = self._build_neighbour_masks((1,))
+        
+        all_dots = bytearray((len(self.cells) + 7) // 8)
+        for i, cell in enumerate(self.cells):
+            if cell == 0:
+                all_dots[i >> 3] |= 1 << (i & 7)
+        
+        # Where power-ups can spawn: any path (eaten or not, so eating dots
+        # never changes it) outside the exclusion zones, in row-major order
+        if spawn_exclusions is None:
+            spawn_exclusions = self._get_ghost_house_bounds()
+        spawn_positions = [
+            (x, y) for x, y in self.get_empty_positions()
+            if not any(x1 <= x <= x2 and y1 <= y <= y2
+                       for x1, y1, x2, y2 in spawn_exclusions)
+        ]
+        return (self.cells, self.tunnel_rows, pacman_masks, ghost_masks,
+                ghost_house_masks, bytes(all_dots), spawn_exclusions,
+                spawn_positions, self._find_positions())
+    
+    def _find_positions(self):
+        """
+        Work out where Pac-Man and the ghosts start from the layout.
+        
+        The ghost house door is the house tiles along its top edge with a
+        path above; ghosts leave from the tile above the door's left end,
+        respawn in the middle of the house below it and start there and
+        two tiles either side (Blinky outside, at the exit). Pac-Man starts
+        on the path closest to three quarters of the way down below the
+        door. For the classic layout this gives the classic positions.
+        """
+        house = self._find_ghost_house()
+        if house:
+            x1, y1, x2, y2 = house
+            door = [x for x in range(x1, x2 + 1)
+                    if self._get_static_cell(x, y1) == 3
+                    and self._get_static_cell(x, y1 - 1) in (0, 2)]
+            door_x = door[0] if door else (x1 + x2) // 2
+            exit_position = (door_x, y1 - 1)
+            respawn = (door_x, (y1 + y2 + 1) // 2)
+            sides = [(door_x + dx, respawn[1]) for dx in (-2, 2)]
+            sides = [side if self.is_ghost_house(*side) else respawn
+                     for side in sides]
+        else:
+            door_x = self.width // 2
+            exit_position = respawn = self._nearest_walkable(
+                door_x, self.height // 3)
+            sides = [respawn, respawn]
+        ghost_starts = [exit_position, respawn] + sides
+        pacman_start = self._nearest_walkable(door_x, self.height * 3 // 4)
+        return pacman_start, ghost_starts, exit_position, respawn
+    
+    def _nearest_walkable(self, grid_x, grid_y):
+        """Get the path tile closest (in steps) to a grid position."""
+        for distance in range(self.width + self.height):
+            for dy in range(-distance, distance + 1):
+                dx = distance - abs(dy)
+                for x in sorted({grid_x - dx, grid_x + dx}):
+                    if self.is_walkable(x, grid_y + dy):
+                        return (x, grid_y + dy)
+        raise ValueError("the layout has no paths")
+    
+    def _find_ghost_house(self):
+        """
+        Get the bounding box (x1, y1, x2, y2) of the first ghost house.
+        
+        A layout with several houses (such as copies of the classic maze
+        side by side) uses the first one in row order. None if there isn't
+        one.
+        """
+        first = self.cells.find(3)
+        if first < 0:
+            return None
+        x1 = x2 = first % self.width
+        y1 = y2 = first // self.width
+        seen = {(x1, y1)}
+        frontier = [(x1, y1)]
+        while frontier:
+            x, y = frontier.pop()
+            x1, x2 = min(x1, x), max(x2, x)
+            y1, y2 = min(y1, y), max(y2, y)
+            for dx, dy in (UP, DOWN, LEFT, RIGHT):
+                neighbour = (x + dx, y + dy)
+                if neighbour not in seen and self.is_ghost_house(*neighbour):
+                    seen.add(neighbour)
+                    frontier.append(neighbour)
+        return x1, y1, x2, y2
+    
+    def _get_ghost_house_bounds(self):
+        """Get the ghost house's bounding box as a spawn exclusion list."""
+        house = [i for i, cell in enumerate(self.cells) if cell == 3]
+        if not house:
+            return ()
+        xs = [i % self.width for i in house]
+        ys = [i // self.width for i in house]
+        return ((min(xs), min(ys), max(xs), max(ys)),)
     
     def reset(self):
         """Reset maze to initial state."""
-        self.layout = [row[:] for row in MAZE_LAYOUT]
-        self.dots_remaining = self._count_dots()
+        self.dots[:] = self._all_dots
+        self.dots_remaining = self.total_dots
+        self._dot_layer = None  # Rebuilt with all dots on next draw
+        self._dirty_rects = []
     
     def get_cell(self, grid_x, grid_y):
         """Get cell value at grid position."""
+        if grid_y in self.tunnel_rows:
+            grid_x %= self.width  # The tunnel leads round to the other side
         if 0 <= grid_x < self.width and 0 <= grid_y < self.height:
-            return self.layout[grid_y][grid_x]
+            i = grid_y * self.width + grid_x
+            cell = self.cells[i]
+            if cell == 0 and not self.dots[i >> 3] >> (i & 7) & 1:
+                return 2  # The dot has been eaten
+            return cell
         return 1  # Treat out of bounds as wall
     
+    def has_dot(self, grid_x, grid_y):
+        """Check if a cell still has its dot."""
+        if 0 <= grid_x < self.width and 0 <= grid_y < self.height:
+            i = grid_y * self.width + grid_x
+            return self.dots[i >> 3] >> (i & 7) & 1 == 1
+        return False
+    
+    def get_neighbour_mask(self, grid_x, grid_y, masks):
+        """
+        Get a tile's neighbour mask from one of the mask tables.
+        
+        masks is pacman_masks, ghost_masks (ghosts outside the ghost house)
+        or ghost_house_masks; test the result against DIRECTION_BITS and
+        TILE_OPEN. Tiles off the maze have no open neighbours.
+        """
+        if grid_y in self.tunnel_rows:
+            grid_x %= self.width
+        if 0 <= grid_x < self.width and 0 <= grid_y < self.height:
+            return masks[grid_y * self.width + grid_x]
+        return 0
+    
+    def _build_neighbour_masks(self, blocking_cells):
+        """
+        Work out every cell's neighbour mask for a walker.
+        
+        Done a row at a time with bytes operations rather than cell by
+        cell, so it stays quick on mazes hundreds of tiles across.
+        """
+        width, size = self.width, len(self.cells)
+        is_open = self.cells.translate(
+            bytes(cell not in blocking_cells for cell in range(256)))
+        closed = bytes(width)
+        
+        # Whether each cell's neighbour in each direction is open (cells
+        # off the maze are walls, except round the ends of tunnel rows)
+        left, right = [], []
+        for y in range(self.height):
+            row = is_open[y * width:(y + 1) * width]
+            wrap = y in self.tunnel_rows
+            left.append((row[-1:] if wrap else b"\0") + row[:-1])
+            right.append(row[1:] + (row[:1] if wrap else b"\0"))
+        layers = [
+            (is_open, TILE_OPEN),
+            (closed + is_open[:-width], DIRECTION_BITS[UP]),
+            (is_open[width:] + closed, DIRECTION_BITS[DOWN]),
+            (b"".join(left), DIRECTION_BITS[LEFT]),
+            (b"".join(right), DIRECTION_BITS[RIGHT]),
+        ]
+        
+        # The bits never overlap, so OR-ing the layers as integers combines
+        # them cell by cell
+        mask = 0
+        for flags, bit in layers:
+            mask |= int.from_bytes(
+                flags.translate(bytes([0, bit]) + bytes(254)), "little")
+        return array("B", mask.to_bytes(size, "little"))
+    
+    def _get_static_cell(self, grid_x, grid_y):
+        """Get the layout's cell value (ignoring eaten dots)."""
+        if grid_y in self.tunnel_rows:
+            grid_x %= self.width
+        if 0 <= grid_x < self.width and 0 <= grid_y < self.height:
+            return self.cells[grid_y * self.width + grid_x]
+        return 1
+    
     def is_wall(self, grid_x, grid_y):
         """Check if a cell is a wall."""
-        cell = self.get_cell(grid_x, grid_y)
-        return cell == 1
+        return self._get_static_cell(grid_x, grid_y) == 1
     
     def is_ghost_house(self, grid_x, grid_y):
         """Check if a cell is in the ghost house."""
-        cell = self.get_cell(grid_x, grid_y)
-        return cell == 3
+        return self._get_static_cell(grid_x, grid_y) == 3
     
     def is_walkable(self, grid_x, grid_y, is_ghost=False):
         """Check if a cell is walkable."""
-        cell = self.get_cell(grid_x, grid_y)
+        cell = self._get_static_cell(grid_x, grid_y)
         if is_ghost:
             return cell != 1  # Ghosts can walk on ghost house
-        return cell in [0, 2]  # Pac-Man can walk on paths
+        return cell in [0, 2]  # Pac-Man can walk on paths (eaten or not)
     
     def is_valid_position(self, pixel_x, pixel_y, is_ghost=False):
         """Check if a pixel position is valid (not in a wall)."""
@@ -107,20 +371,200 @@ class Maze:
     def eat_dot(self, grid_x, grid_y):
         """Eat a dot at the given position. Returns True if dot was eaten."""
         if 0 <= grid_x < self.width and 0 <= grid_y < self.height:
-            if self.layout[grid_y][grid_x] == 0:
-                self.layout[grid_y][grid_x] = 2  # Mark as empty path
+            i = grid_y * self.width + grid_x
+            bit = 1 << (i & 7)
+            if self.dots[i >> 3] & bit:
+                self.dots[i >> 3] &= ~bit  # Leaves an empty path
                 self.dots_remaining -= 1
+                self._clear_dot(grid_x, grid_y)
+                self._dirty_rects.append(self._tile_rect(grid_x, grid_y).move(
+                    MAZE_OFFSET_X, MAZE_OFFSET_Y))
                 return True
         return False
     
     def get_empty_positions(self):
-        """Get list of empty path positions (for spawning items)."""
-        positions = []
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.layout[y][x] in [0, 2]:
-                    positions.append((x, y))
-        return positions
+        """Get list of empty path positions (see spawn_positions for items)."""
+        width = self.width
+        return [(i % width, i // width) for i, cell in enumerate(self.cells)
+                if cell in (0, 2)]
+    
+    def distance(self, from_x, from_y, to_x, to_y):
+        """
+        Get the length of the shortest path between two tiles, in tiles.
+        
+        Paths run along the corridors outside the ghost house and through
+        the tunnel. Returns None if either tile is off the paths or no path
+        joins them.
+        """
+        _, _, table, count = self.get_distance_table()
+        source = self.path_tile(from_x, from_y)
+        target = self.path_tile(to_x, to_y)
+        if source < 0 or target < 0:
+            return None
+        distance = table[source * count + target]
+        return None if distance == UNREACHABLE else distance
+    
+    def path_tile(self, grid_x, grid_y):
+        """Get a tile's number among the path tiles (-1 when off them)."""
+        if grid_y in self.tunnel_rows:
+            grid_x %= self.width
+        if 0 <= grid_x < self.width and 0 <= grid_y < self.height:
+            return self._get_path_graph()[0][grid_y * self.width + grid_x]
+        return -1
+    
+    def nearest_path_tile(self, grid_x, grid_y):
+        """Get the path tile closest to a grid position (e.g. a wall)."""
+        grid_x = max(0, min(self.width - 1, grid_x))
+        grid_y = max(0, min(self.height - 1, grid_y))
+        nearest = self._get_path_graph()[3]
+        cell = nearest[grid_y * self.width + grid_x]
+        return cell % self.width, cell // self.width
+    
+    def get_flow_field(self, target_x, target_y):
+        """
+        Get the path distance from every path tile to a target.
+        
+        The result is indexed by path_tile() number. Targets off the paths
+        use the nearest path tile. Each field is one BFS out from its target,
+        and the fields for the last few targets are kept, so all the ghosts
+        heading for a tile share one and it is only recomputed once the
+        target moves to another tile.
+        """
+        index, _, neighbours, nearest = self._get_path_graph()
+        target_x = max(0, min(self.width - 1, target_x))
+        target_y = max(0, min(self.height - 1, target_y))
+        target = index[nearest[target_y * self.width + target_x]]
+        
+        field = self._flow_fields.get(target)
+        if field is None:
+            field = array("H", [UNREACHABLE]) * len(neighbours)
+            _path_bfs(neighbours, target, field, 0)
+            self._flow_fields[target] = field
+            if len(self._flow_fields) > FLOW_FIELD_CACHE_SIZE:
+                self._flow_fields.popitem(last=False)
+        else:
+            self._flow_fields.move_to_end(target)
+        return field
+    
+    def get_distance_table(self):
+        """
+        Get the path distance data as (index, nearest, table, count).
+        
+        index maps each cell (y * width + x) to its path tile number, or -1
+        off the paths; nearest maps each cell to the closest path cell; and
+        table holds the count x count distances between path tiles. Built
+        once per layout (and cached on disk), so it costs O(tiles^2) memory;
+        get_flow_field only needs O(tiles) per target.
+        """
+        if self._distances is None:
+            key = self._layout_key()
+            if key not in Maze._distance_tables:
+                Maze._distance_tables[key] = self._build_distance_table(key)
+            self._distances = Maze._distance_tables[key]
+        index, _, neighbours, nearest = self._get_path_graph()
+        return index, nearest, self._distances, len(neighbours)
+    
+    def _get_path_graph(self):
+        """Get (index, tiles, neighbours, nearest) for this layout."""
+        if self._graph is None:
+            key = self._layout_key()
+            if key not in Maze._path_graphs:
+                Maze._path_graphs[key] = self._build_path_graph()
+            self._graph = Maze._path_graphs[key]
+        return self._graph
+    
+    def _layout_key(self):
+        """Hash the parts of the layout that decide path distances."""
+        blocked = bytes(cell in (1, 3) for cell in self.cells)
+        size = (f"v{DISTANCE_CACHE_VERSION}:"
+                f"{self.width}x{self.height}:").encode()
+        return hashlib.sha1(size + blocked).hexdigest()
+    
+    def _build_path_graph(self):
+        """Number the path tiles and link each to its open neighbours."""
+        # Path tiles are the cells ghosts outside the house can stand on,
+        # and the ghost masks already say which neighbours are open
+        width, masks = self.width, self.ghost_masks
+        cells = [i for i, mask in enumerate(masks) if mask & TILE_OPEN]
+        index = array("i", [-1]) * len(masks)
+        for number, i in enumerate(cells):
+            index[i] = number
+        tiles = [(i % width, i // width) for i in cells]
+        
+        up, down = DIRECTION_BITS[UP], DIRECTION_BITS[DOWN]
+        left, right = DIRECTION_BITS[LEFT], DIRECTION_BITS[RIGHT]
+        neighbours = []
+        for i in cells:
+            mask = masks[i]
+            row = i - i % width  # Left and right wrap round tunnel rows
+            tile_neighbours = []
+            if mask & up:
+                tile_neighbours.append(index[i - width])
+            if mask & down:
+                tile_neighbours.append(index[i + width])
+            if mask & left:
+                tile_neighbours.append(index[row + (i - 1 - row) % width])
+            if mask & right:
+                tile_neighbours.append(index[row + (i + 1 - row) % width])
+            neighbours.append(tile_neighbours)
+        
+        return index, tiles, neighbours, self._build_nearest_path(cells)
+    
+    def _build_distance_table(self, key):
+        """BFS from every path tile, or load the result cached on disk."""
+        count = len(self._get_path_graph()[2])
+        path = os.path.join(DISTANCE_CACHE_DIR, f"distances-{key}.bin")
+        table = array("H")
+        try:
+            with open(path, "rb") as f:
+                table.fromfile(f, count * count)
+            return table
+        except (OSError, EOFError):
+            pass  # Not cached yet (or unreadable), so work it out
+        
+        neighbours = self._get_path_graph()[2]
+        table = array("H", [UNREACHABLE]) * (count * count)
+        for source in range(count):
+            _path_bfs(neighbours, source, table, source * count)
+        
+        # Written to a temporary file and moved into place, so processes
+        # building the same table at once never read a half-written one
+        try:
+            os.makedirs(DISTANCE_CACHE_DIR, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=DISTANCE_CACHE_DIR,
+                                             suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    table.tofile(f)
+                os.replace(temp_path, path)
+            except OSError:
+                os.remove(temp_path)
+                raise
+        except OSError:
+            pass  # Read-only or no file system (e.g. in the browser)
+        return table
+    
+    def _build_nearest_path(self, cells):
+        """Map every cell to its closest path cell (BFS out from the paths)."""
+        width, size = self.width, self.width * self.height
+        nearest = array("i", [-1]) * size
+        for i in cells:
+            nearest[i] = i
+        frontier = cells
+        while frontier:
+            next_frontier = []
+            for i in frontier:
+                source = nearest[i]
+                x = i % width
+                for j in (i - width if i >= width else -1,
+                          i + width if i + width < size else -1,
+                          i - 1 if x > 0 else -1,
+                          i + 1 if x + 1 < width else -1):
+                    if j >= 0 and nearest[j] < 0:
+                        nearest[j] = source
+                        next_frontier.append(j)
+            frontier = next_frontier
+        return nearest
     
     def grid_to_pixel(self, grid_x, grid_y):
         """Convert grid position to pixel position (center of tile)."""
@@ -134,47 +578,134 @@ class Maze:
         grid_y = int((pixel_y - MAZE_OFFSET_Y) // TILE_SIZE)
         return grid_x, grid_y
     
-    def draw(self, screen):
-        """Draw the maze on the screen."""
+    def _tile_rect(self, grid_x, grid_y):
+        """Get the rectangle of a tile on the cached maze surfaces."""
+        return pygame.Rect(grid_x * TILE_SIZE, grid_y * TILE_SIZE,
+                           TILE_SIZE, TILE_SIZE)
+    
+    def _build_static_surface(self):
+        """Bake walls, ghost house and paths into a surface (done once)."""
+        surface = pygame.Surface((self.width * TILE_SIZE,
+                                  self.height * TILE_SIZE))
+        surface.fill(PATH_COLOR)
+        darker_wall = (170, 80, 110)
+        ghost_house_color = (40, 20, 30)
         for y in range(self.height):
             for x in range(self.width):
-                cell = self.layout[y][x]
-                rect_x = MAZE_OFFSET_X + x * TILE_SIZE
-                rect_y = MAZE_OFFSET_Y + y * TILE_SIZE
-                rect = pygame.Rect(rect_x, rect_y, TILE_SIZE, TILE_SIZE)
+                cell = self.cells[y * self.width + x]
+                rect = self._tile_rect(x, y)
                 
                 if cell == 1:  # Wall
-                    pygame.draw.rect(screen, WALL_COLOR, rect)
+                    pygame.draw.rect(surface, WALL_COLOR, rect)
                     # Add inner darker rectangle for depth
-                    inner_rect = pygame.Rect(rect_x + 2, rect_y + 2, 
-                                            TILE_SIZE - 4, TILE_SIZE - 4)
-                    darker_wall = (170, 80, 110)
-                    pygame.draw.rect(screen, darker_wall, inner_rect)
+                    pygame.draw.rect(surface, darker_wall, rect.inflate(-4, -4))
                 elif cell == 3:  # Ghost house
-                    ghost_house_color = (40, 20, 30)
-                    pygame.draw.rect(screen, ghost_house_color, rect)
-                else:  # Path
-                    pygame.draw.rect(screen, PATH_COLOR, rect)
-                    
-                    # Draw dot if present
-                    if cell == 0:
-                        dot_x = rect_x + TILE_SIZE // 2
-                        dot_y = rect_y + TILE_SIZE // 2
-                        pygame.draw.circle(screen, DOT_COLOR, (dot_x, dot_y), 3)
+                    pygame.draw.rect(surface, ghost_house_color, rect)
+        # Match the display pixel format when there is one for faster blits
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        return surface
+    
+    def _build_dot_layer(self):
+        """Draw all remaining dots onto a transparent layer."""
+        layer = pygame.Surface((self.width * TILE_SIZE,
+                                self.height * TILE_SIZE), pygame.SRCALPHA)
+        for y in range(self.height):
+            for x in range(self.width):
+                if self.has_dot(x, y):
+                    pygame.draw.circle(layer, DOT_COLOR,
+                                       self._tile_rect(x, y).center, 3)
+        if pygame.display.get_surface() is not None:
+            layer = layer.convert_alpha()
+        return layer
+    
+    def _clear_dot(self, grid_x, grid_y):
+        """Erase a single dot from the dot layer (if it has been built)."""
+        if self._dot_layer is not None:
+            self._dot_layer.fill((0, 0, 0, 0), self._tile_rect(grid_x, grid_y))
+    
+    def _get_layers(self):
+        """Get the static surface and dot layer, building them if needed."""
+        # The static geometry never changes, so it is shared by every maze
+        # and only rendered the first time it is needed.
+        static_surface = Maze._static_surfaces.get(self._layout)
+        if static_surface is None:
+            static_surface = self._build_static_surface()
+            Maze._static_surfaces[self._layout] = static_surface
+        if self._dot_layer is None:
+            self._dot_layer = self._build_dot_layer()
+        return static_surface, self._dot_layer
+    
+    def draw(self, screen):
+        """Draw the maze on the screen."""
+        static_surface, dot_layer = self._get_layers()
+        screen.blit(static_surface, (MAZE_OFFSET_X, MAZE_OFFSET_Y))
+        screen.blit(dot_layer, (MAZE_OFFSET_X, MAZE_OFFSET_Y))
+    
+    def draw_areas(self, screen, rects):
+        """
+        Redraw the background and maze within each of rects.
+        
+        The same as drawing the whole maze clipped to each rect in turn,
+        but in three batched calls however many rects there are.
+        """
+        static_surface, dot_layer = self._get_layers()
+        screen_rect = screen.get_rect()
+        maze_rect = static_surface.get_rect(
+            topleft=(MAZE_OFFSET_X, MAZE_OFFSET_Y))
+        areas = []
+        for rect in rects:
+            # The opaque static layer covers the maze, so only areas
+            # reaching outside it need the background. Both are clipped
+            # first, as fill() and blit areas starting off the surface are
+            # shifted rather than clipped.
+            if not maze_rect.contains(rect):
+                screen.fill(BG_COLOR, rect.clip(screen_rect))
+            inside = rect.clip(maze_rect)
+            if inside:
+                areas.append(
+                    (inside, inside.move(-MAZE_OFFSET_X, -MAZE_OFFSET_Y)))
+        screen.blits([(static_surface, rect, area) for rect, area in areas],
+                     doreturn=False)
+        screen.blits([(dot_layer, rect, area) for rect, area in areas],
+                     doreturn=False)
+    
+    def pop_dirty_rects(self):
+        """Return (and forget) the screen areas changed by eaten dots."""
+        rects = self._dirty_rects
+        self._dirty_rects = []
+        return rects
     
     def get_pacman_start(self):
         """Get Pac-Man's starting position (grid coordinates)."""
-        return (13, 23)  # Classic starting position
+        return self._positions[0]  # (13, 23) in the classic maze
     
     def get_ghost_start_positions(self):
         """Get ghosts' starting positions (grid coordinates)."""
-        return [
-            (13, 11),  # Blinky - above ghost house
-            (13, 14),  # Pinky - center of ghost house
-            (11, 14),  # Inky - left in ghost house
-            (15, 14),  # Clyde - right in ghost house
-        ]
+        # Blinky above the ghost house, then Pinky in its centre and Inky
+        # and Clyde to the left and right
+        return list(self._positions[1])
     
     def get_ghost_house_exit(self):
         """Get the ghost house exit position."""
-        return (13, 11)  # Just above the ghost house
+        return self._positions[2]  # Just above the ghost house
+    
+    def get_ghost_respawn(self):
+        """Get where eliminated ghosts come back (in the ghost house)."""
+        return self._positions[3]
+
+
+def _path_bfs(neighbours, source, distances, offset):
+    """Fill distances[offset + tile] with each path tile's distance to source."""
+    distances[offset + source] = 0
+    frontier = [source]
+    distance = 0
+    while frontier:
+        distance += 1
+        next_frontier = []
+        for tile in frontier:
+            for neighbour in neighbours[tile]:
+                if distances[offset + neighbour] == UNREACHABLE:
+                    distances[offset + neighbour] = distance
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
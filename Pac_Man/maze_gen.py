@@ -0,0 +1,297 @@
+"""
+Procedural maze generator for Valentine's Pac-Man game.
+Makes seeded, left-right symmetric Pac-Man style layouts of any size:
+one-tile corridors with no dead ends, a ghost house in the middle with a
+corridor round it, and tunnels through the side walls. Maze works out
+the start positions, house exit and respawn point from the layout.
+
+Usage:
+    python maze_gen.py [--width 28] [--height 31] [--seed 0] [--show]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+PITCH = 3  # Tiles from one corridor crossing to the next (1 path, 2 wall)
+MIN_NODES_X = 6  # Crossings across (room for the house and its corridor)
+MIN_NODES_Y = 5
+LOOP_CHANCE = 0.15  # Chance of an extra corridor at each crossing
+TUNNEL_SPACING = 10  # Crossing rows per tunnel (at least one tunnel)
+
+
+class MazeGenerator:
+    """
+    Lays out a maze on a lattice of corridor crossings.
+    
+    Crossings sit every PITCH tiles and corridors join neighbouring ones.
+    A random spanning tree over the left half (plus the ghost house's
+    ring) keeps every path connected; then each dead end gets another
+    corridor and a few extra loops are added. Every corridor is mirrored
+    onto the right half as it is added, so the maze is symmetric.
+    """
+    
+    def __init__(self, width, height, seed=None):
+        self.nodes_x = width // PITCH
+        self.nodes_y = height // PITCH
+        if self.nodes_x < MIN_NODES_X or self.nodes_y < MIN_NODES_Y:
+            raise ValueError(
+                f"mazes need at least {MIN_NODES_X * PITCH}x"
+                f"{MIN_NODES_Y * PITCH} tiles, not {width}x{height}")
+        self.width = self.nodes_x * PITCH
+        self.height = self.nodes_y * PITCH
+        self.rng = random.Random(seed)
+        
+        # Corridors from each crossing (y * nodes_x + x) to the right and down
+        count = self.nodes_x * self.nodes_y
+        self.right = bytearray(count)
+        self.down = bytearray(count)
+        self.degree = bytearray(count)
+        self.reserved = bytearray(count)  # Crossings inside the ghost house
+        self.tunnel_rows = []  # Crossing rows with tunnels at both ends
+        
+        # The house's ring of crossings: symmetric about the middle, four
+        # (or five, with an odd count) crossings wide and three high
+        span = 3 if self.nodes_x % 2 == 0 else 4
+        self.ring_x1 = (self.nodes_x - 1 - span) // 2
+        self.ring_x2 = self.ring_x1 + span
+        self.ring_y1 = (self.nodes_y - 3) // 2
+        self.ring_y2 = self.ring_y1 + 2
+    
+    def _mirror(self, x):
+        """Mirror a crossing column onto the other half."""
+        return self.nodes_x - 1 - x
+    
+    def _add_right(self, x, y):
+        """Join crossing (x, y) to its right neighbour, and the mirror."""
+        for left in {x, self._mirror(x + 1)}:
+            i = y * self.nodes_x + left
+            if not self.right[i]:
+                self.right[i] = 1
+                self.degree[i] += 1
+                self.degree[i + 1] += 1
+    
+    def _add_down(self, x, y):
+        """Join crossing (x, y) to the one below, and the mirror."""
+        for column in {x, self._mirror(x)}:
+            i = y * self.nodes_x + column
+            if not self.down[i]:
+                self.down[i] = 1
+                self.degree[i] += 1
+                self.degree[i + self.nodes_x] += 1
+    
+    def _add_ring(self):
+        """Reserve the house's crossings and join the ring round them."""
+        for y in range(self.ring_y1 + 1, self.ring_y2):
+            for x in range(self.ring_x1 + 1, self.ring_x2):
+                self.reserved[y * self.nodes_x + x] = 1
+        for x in range(self.ring_x1, self.ring_x2):
+            self._add_right(x, self.ring_y1)
+            self._add_right(x, self.ring_y2)
+        for y in range(self.ring_y1, self.ring_y2):
+            self._add_down(self.ring_x1, y)
+    
+    def _candidate_edges(self):
+        """Every corridor the left half could have: (x, y, is_right)."""
+        half = (self.nodes_x - 1) // 2  # Last column of the left half
+        edges = []
+        for y in range(self.nodes_y):
+            for x in range(half + 1):
+                i = y * self.nodes_x + x
+                if self.reserved[i]:
+                    continue
+                if x < half and not self.reserved[i + 1]:
+                    edges.append((x, y, True))
+                if y + 1 < self.nodes_y and not self.reserved[
+                        i + self.nodes_x]:
+                    edges.append((x, y, False))
+        return edges
+    
+    def _add_spanning_tree(self):
+        """Join the left half's crossings with a random spanning tree."""
+        parent = list(range(self.nodes_x * self.nodes_y))
+        
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        # The ring is already joined
+        for y in range(self.nodes_y):
+            for x in range(self.nodes_x - 1):
+                i = y * self.nodes_x + x
+                if self.right[i]:
+                    parent[find(i)] = find(i + 1)
+                if self.down[i]:
+                    parent[find(i)] = find(i + self.nodes_x)
+        
+        edges = self._candidate_edges()
+        self.rng.shuffle(edges)
+        for x, y, is_right in edges:
+            i = y * self.nodes_x + x
+            j = i + 1 if is_right else i + self.nodes_x
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[root_i] = root_j
+                if is_right:
+                    self._add_right(x, y)
+                else:
+                    self._add_down(x, y)
+    
+    def _add_tunnels(self):
+        """Open tunnels at the ends of a few crossing rows."""
+        rows = [y for y in range(1, self.nodes_y - 1)
+                if not self.ring_y1 <= y <= self.ring_y2]
+        if not rows:
+            rows = list(range(1, self.nodes_y - 1))  # Small maze: any row
+        count = max(1, self.nodes_y // TUNNEL_SPACING)
+        self.tunnel_rows = sorted(self.rng.sample(rows, min(count, len(rows))))
+        for y in self.tunnel_rows:
+            for x in (0, self.nodes_x - 1):
+                self.degree[y * self.nodes_x + x] += 1
+    
+    def _open_neighbours(self, x, y):
+        """Neighbouring crossings (x, y) could get a corridor to."""
+        i = y * self.nodes_x + x
+        options = []
+        if x > 0 and not self.right[i - 1] and not self.reserved[i - 1]:
+            options.append((x - 1, y, True))
+        if (x + 1 < self.nodes_x and not self.right[i]
+                and not self.reserved[i + 1]):
+            options.append((x, y, True))
+        if (y > 0 and not self.down[i - self.nodes_x]
+                and not self.reserved[i - self.nodes_x]):
+            options.append((x, y - 1, False))
+        if (y + 1 < self.nodes_y and not self.down[i]
+                and not self.reserved[i + self.nodes_x]):
+            options.append((x, y, False))
+        return options
+    
+    def _add_loops(self):
+        """Give every dead end another corridor, plus some extra loops."""
+        half = (self.nodes_x - 1) // 2
+        for y in range(self.nodes_y):
+            for x in range(half + 1):
+                i = y * self.nodes_x + x
+                if self.reserved[i]:
+                    continue
+                if self.degree[i] >= 2 and self.rng.random() >= LOOP_CHANCE:
+                    continue
+                options = self._open_neighbours(x, y)
+                if not options:
+                    continue
+                ex, ey, is_right = self.rng.choice(options)
+                if is_right:
+                    self._add_right(ex, ey)
+                else:
+                    self._add_down(ex, ey)
+    
+    def generate(self):
+        """Lay out the maze; return it as rows of cells (see MAZE_LAYOUT)."""
+        self._add_ring()
+        self._add_spanning_tree()
+        self._add_tunnels()
+        self._add_loops()
+        return self._render()
+    
+    def _render(self):
+        """Turn the crossings and corridors into rows of tiles."""
+        rows = [bytearray(b"\x01" * self.width) for _ in range(self.height)]
+        for y in range(self.nodes_y):
+            tile_y = y * PITCH + 1
+            row = rows[tile_y]
+            for x in range(self.nodes_x):
+                i = y * self.nodes_x + x
+                if self.reserved[i]:
+                    continue
+                tile_x = x * PITCH + 1
+                row[tile_x] = 0
+                if self.right[i]:
+                    row[tile_x + 1:tile_x + PITCH + 1] = bytes(PITCH)
+                if self.down[i]:
+                    for step in range(1, PITCH):
+                        rows[tile_y + step][tile_x] = 0
+        
+        # No dots in the tunnels or round the house, as in the classic maze
+        for y in self.tunnel_rows:
+            rows[y * PITCH + 1][0] = rows[y * PITCH + 1][-1] = 2
+        top = self.ring_y1 * PITCH + 1
+        bottom = self.ring_y2 * PITCH + 1
+        left = self.ring_x1 * PITCH + 1
+        right = self.ring_x2 * PITCH + 1
+        for x in range(left, right + 1):
+            rows[top][x] = rows[bottom][x] = 2
+        for y in range(top, bottom + 1):
+            rows[y][left] = rows[y][right] = 2
+        
+        # The house: walls inside the ring, hollow, with a door in the
+        # middle of the top wall
+        for y in range(top + 2, bottom - 1):
+            for x in range(left + 2, right - 1):
+                rows[y][x] = 3
+        middle = self.width // 2
+        for x in {middle, self.width - 1 - middle}:
+            rows[top + 1][x] = 3
+        
+        return [list(row) for row in rows]
+
+
+def generate_layout(width, height, seed=None):
+    """
+    Make a symmetric maze layout, rounded down to a multiple of PITCH.
+    
+    The same seed and size always give the same maze.
+    """
+    return MazeGenerator(width, height, seed).generate()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--width", type=int, default=28)
+    parser.add_argument("--height", type=int, default=31)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--show", action="store_true",
+                        help="print the maze as text")
+    args = parser.parse_args()
+    
+    from maze import Maze
+    
+    def build():
+        """Generate the maze, build it and its first flow field; time each."""
+        start = time.perf_counter()
+        layout = generate_layout(args.width, args.height, args.seed)
+        generated = time.perf_counter()
+        maze = Maze(layout)
+        built = time.perf_counter()
+        maze.get_flow_field(*maze.get_pacman_start())
+        flowed = time.perf_counter()
+        return layout, maze, (generated - start, built - generated,
+                              flowed - built)
+    
+    layout, maze, times = build()
+    
+    # Again from scratch with allocations traced (too slow to time)
+    Maze.clear_layout_caches()
+    tracemalloc.start()
+    build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    if args.show:
+        chars = {0: ".", 1: "#", 2: " ", 3: "="}
+        for row in layout:
+            print("".join(chars[cell] for cell in row))
+    print(f"{maze.width}x{maze.height} maze, seed {args.seed}: "
+          f"{maze.total_dots} dots, tunnel rows {sorted(maze.tunnel_rows)}")
+    print(f"Pac-Man starts at {maze.get_pacman_start()}, ghosts at "
+          f"{maze.get_ghost_start_positions()}")
+    generate_ms, build_ms, flow_ms = (t * 1000 for t in times)
+    print(f"generate {generate_ms:.0f} ms, Maze() {build_ms:.0f} ms, "
+          f"first flow field {flow_ms:.0f} ms, "
+          f"peak memory {peak / 2 ** 20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,30 +6,46 @@ Handles movement, power-up state, and rendering.
 import pygame
 import math
 from config import (
-    TILE_SIZE, MAZE_OFFSET_X, MAZE_OFFSET_Y,
-    PACMAN_SPEED, PACMAN_COLOR, POWERUP_DURATION,
+    TILE_SIZE, PACMAN_SPEED, PACMAN_COLOR, POWERUP_DURATION,
     UP, DOWN, LEFT, RIGHT, NONE, HEART_COLOR
 )
+from maze import TILE_OPEN
+from sprite_cache import SpriteCache
+from subpixel import (
+    SUBPIXEL, TILE, HALF_TILE, ORIGIN_X, to_subpixels, to_pixels,
+    whole_pixels, tile_center_x, tile_center_y, grid_x_of, grid_y_of
+)
+from timestep import interpolate
+
+# Pre-rendered frames: 4 directions x 9 mouth angles x (1 + power-up pulse
+# colours), plus the mini heart
+PULSE_STEPS = 10
+ORBIT_STEPS = 60
+MINI_HEART_SIZE = 4
+_atlas = SpriteCache(max_entries=4 * 9 * (PULSE_STEPS + 2) + 1)
+_orbit_offsets = {}  # Pac-Man radius -> mini-heart offsets around the orbit
 
 
 class PacMan:
     """Pac-Man character with movement and power-up abilities."""
     
     def __init__(self, start_grid_x, start_grid_y):
-        # Position (pixel coordinates - center of Pac-Man)
         self.start_grid_x = start_grid_x
         self.start_grid_y = start_grid_y
         self.reset()
-        
+    
     def reset(self):
         """Reset Pac-Man to starting position and state."""
-        self.x = MAZE_OFFSET_X + self.start_grid_x * TILE_SIZE + TILE_SIZE // 2
-        self.y = MAZE_OFFSET_Y + self.start_grid_y * TILE_SIZE + TILE_SIZE // 2
+        self.radius = TILE_SIZE // 2 - 2
+        self.box_size = self.radius * 2  # Collision box, like get_rect()
+        self._move_to(tile_center_x(self.start_grid_x),
+                      tile_center_y(self.start_grid_y))
+        self.prev_x, self.prev_y = self.x, self.y  # Position at the last tick
+        self.draw_x, self.draw_y = self.x, self.y  # Interpolated for drawing
         self.direction = NONE
         self.next_direction = NONE
         self.facing_direction = RIGHT  # Direction for shooting hearts
-        self.speed = PACMAN_SPEED
-        self.radius = TILE_SIZE // 2 - 2
+        self.speed = to_subpixels(PACMAN_SPEED)  # Sub-pixel steps per tick
         
         # Power-up state
         self.powered_up = False
@@ -39,7 +55,27 @@ class PacMan:
         self.mouth_angle = 45
         self.mouth_opening = True
         self.animation_speed = 5
-        
+    
+    @property
+    def x(self):
+        """Pixel x position of Pac-Man's centre."""
+        return to_pixels(self.sub_x)
+    
+    @property
+    def y(self):
+        """Pixel y position of Pac-Man's centre."""
+        return to_pixels(self.sub_y)
+    
+    def _move_to(self, sub_x, sub_y):
+        """Set the position (in sub-pixel steps), tile and collision box."""
+        self.sub_x = sub_x
+        self.sub_y = sub_y
+        self.grid_x = grid_x_of(sub_x)
+        self.grid_y = grid_y_of(sub_y)
+        offset = self.radius * SUBPIXEL
+        self.left = whole_pixels(sub_x - offset)
+        self.top = whole_pixels(sub_y - offset)
+    
     def handle_input(self, keys):
         """Handle keyboard input for direction changes."""
         if keys[pygame.K_UP] or keys[pygame.K_w]:
@@ -54,45 +90,42 @@ class PacMan:
     def _can_move(self, direction, maze):
         """Check if Pac-Man can move in a given direction."""
         # Calculate next position
-        test_x = self.x + direction[0] * self.speed * 2
-        test_y = self.y + direction[1] * self.speed * 2
-        
-        # Check all corners of Pac-Man's bounding box
-        corners = [
-            (test_x - self.radius + 2, test_y - self.radius + 2),
-            (test_x + self.radius - 2, test_y - self.radius + 2),
-            (test_x - self.radius + 2, test_y + self.radius - 2),
-            (test_x + self.radius - 2, test_y + self.radius - 2),
-        ]
+        test_x = self.sub_x + direction[0] * self.speed * 2
+        test_y = self.sub_y + direction[1] * self.speed * 2
+        
+        # Check all corners of Pac-Man's bounding box (the tiles under them)
+        inset = (self.radius - 2) * SUBPIXEL
+        left = grid_x_of(test_x - inset)
+        right = grid_x_of(test_x + inset)
+        top = grid_y_of(test_y - inset)
+        bottom = grid_y_of(test_y + inset)
         
-        for corner_x, corner_y in corners:
-            grid_x = int((corner_x - MAZE_OFFSET_X) // TILE_SIZE)
-            grid_y = int((corner_y - MAZE_OFFSET_Y) // TILE_SIZE)
-            if maze.is_wall(grid_x, grid_y) or maze.is_ghost_house(grid_x, grid_y):
-                return False
-        return True
+        # Walls and the ghost house block Pac-Man
+        masks = maze.pacman_masks
+        get_mask = maze.get_neighbour_mask
+        return bool(get_mask(left, top, masks) & get_mask(right, top, masks) &
+                    get_mask(left, bottom, masks) &
+                    get_mask(right, bottom, masks) & TILE_OPEN)
     
     def _is_aligned_with_grid(self):
         """Check if Pac-Man is aligned with the tile grid."""
-        tile_center_x = MAZE_OFFSET_X + (self.get_grid_x() * TILE_SIZE) + TILE_SIZE // 2
-        tile_center_y = MAZE_OFFSET_Y + (self.get_grid_y() * TILE_SIZE) + TILE_SIZE // 2
-        
-        tolerance = self.speed + 1
-        return (abs(self.x - tile_center_x) <= tolerance and 
-                abs(self.y - tile_center_y) <= tolerance)
+        tolerance = self.speed + SUBPIXEL
+        return (abs(self.sub_x - tile_center_x(self.grid_x)) <= tolerance and 
+                abs(self.sub_y - tile_center_y(self.grid_y)) <= tolerance)
     
     def _snap_to_grid(self):
         """Snap Pac-Man to the nearest grid center."""
-        tile_center_x = MAZE_OFFSET_X + (self.get_grid_x() * TILE_SIZE) + TILE_SIZE // 2
-        tile_center_y = MAZE_OFFSET_Y + (self.get_grid_y() * TILE_SIZE) + TILE_SIZE // 2
-        
+        sub_x, sub_y = self.sub_x, self.sub_y
         if self.direction[0] == 0:  # Moving vertically
-            self.x = tile_center_x
+            sub_x = tile_center_x(self.grid_x)
         if self.direction[1] == 0:  # Moving horizontally
-            self.y = tile_center_y
+            sub_y = tile_center_y(self.grid_y)
+        self._move_to(sub_x, sub_y)
     
     def update(self, maze, current_time):
         """Update Pac-Man's position and state."""
+        self.prev_x, self.prev_y = self.x, self.y
+        
         # Check power-up expiration
         if self.powered_up:
             if current_time - self.powerup_start_time > POWERUP_DURATION:
@@ -109,14 +142,15 @@ class PacMan:
         # Move in current direction
         if self.direction != NONE:
             if self._can_move(self.direction, maze):
-                self.x += self.direction[0] * self.speed
-                self.y += self.direction[1] * self.speed
+                sub_x = self.sub_x + self.direction[0] * self.speed
+                sub_y = self.sub_y + self.direction[1] * self.speed
                 
                 # Handle tunnel wrap-around
-                if self.x < MAZE_OFFSET_X:
-                    self.x = MAZE_OFFSET_X + maze.width * TILE_SIZE - TILE_SIZE // 2
-                elif self.x > MAZE_OFFSET_X + maze.width * TILE_SIZE:
-                    self.x = MAZE_OFFSET_X + TILE_SIZE // 2
+                if sub_x < ORIGIN_X:
+                    sub_x = ORIGIN_X + maze.width * TILE - HALF_TILE
+                elif sub_x > ORIGIN_X + maze.width * TILE:
+                    sub_x = ORIGIN_X + HALF_TILE
+                self._move_to(sub_x, sub_y)
             else:
                 # Stop when hitting a wall
                 self._snap_to_grid()
@@ -146,77 +180,133 @@ class PacMan:
     
     def get_grid_x(self):
         """Get current grid X position."""
-        return int((self.x - MAZE_OFFSET_X) // TILE_SIZE)
+        return self.grid_x
     
     def get_grid_y(self):
         """Get current grid Y position."""
-        return int((self.y - MAZE_OFFSET_Y) // TILE_SIZE)
+        return self.grid_y
     
     def get_rect(self):
-        """Get Pac-Man's collision rectangle."""
+        """Get Pac-Man's collision rectangle (a new Rect)."""
+        return pygame.Rect(self.left, self.top, self.box_size, self.box_size)
+    
+    def interpolate(self, alpha):
+        """Set the position to draw at, alpha of the way through this tick."""
+        self.draw_x = interpolate(self.prev_x, self.x, alpha)
+        self.draw_y = interpolate(self.prev_y, self.y, alpha)
+    
+    def get_draw_rect(self):
+        """Get the screen area covered by Pac-Man's sprite."""
+        # Orbiting mini-hearts extend past the body while powered up
+        extent = self.radius + (9 if self.powered_up else 2)
         return pygame.Rect(
-            self.x - self.radius,
-            self.y - self.radius,
-            self.radius * 2,
-            self.radius * 2
+            int(self.draw_x) - extent,
+            int(self.draw_y) - extent,
+            extent * 2 + 1,
+            extent * 2 + 1
         )
     
-    def draw(self, screen):
-        """Draw Pac-Man on the screen."""
+    def _get_color(self, current_time):
+        """Get Pac-Man's body colour, quantised so frames can be cached."""
+        if not self.powered_up:
+            return PACMAN_COLOR
+        # Pulsing effect when powered up
+        pulse = round(abs(math.sin(current_time / 100)) * PULSE_STEPS)
+        pulse = pulse * 50 // PULSE_STEPS
+        return (255, 223 - pulse, pulse)
+    
+    def _render_frame(self, facing_direction, mouth_angle, color):
+        """Render one Pac-Man frame centred on its own surface."""
         # Calculate mouth direction angle
-        if self.facing_direction == RIGHT:
-            start_angle = self.mouth_angle
-        elif self.facing_direction == LEFT:
-            start_angle = 180 + self.mouth_angle
-        elif self.facing_direction == UP:
-            start_angle = 90 + self.mouth_angle
+        if facing_direction == RIGHT:
+            start_angle = mouth_angle
+        elif facing_direction == LEFT:
+            start_angle = 180 + mouth_angle
+        elif facing_direction == UP:
+            start_angle = 90 + mouth_angle
         else:  # DOWN
-            start_angle = 270 + self.mouth_angle
+            start_angle = 270 + mouth_angle
         
-        end_angle = start_angle + (360 - 2 * self.mouth_angle)
+        end_angle = start_angle + (360 - 2 * mouth_angle)
         
-        # Draw Pac-Man body
-        color = PACMAN_COLOR
-        if self.powered_up:
-            # Pulsing effect when powered up
-            pulse = abs(math.sin(pygame.time.get_ticks() / 100)) * 50
-            color = (255, int(223 - pulse), int(pulse))
+        center = self.radius + 1
+        surface = pygame.Surface((center * 2 + 1, center * 2 + 1),
+                                 pygame.SRCALPHA)
         
         # Draw as pie slice (mouth open)
-        points = [(int(self.x), int(self.y))]
+        points = [(center, center)]
         for angle in range(int(start_angle), int(end_angle) + 1, 10):
             rad = math.radians(angle)
-            px = self.x + self.radius * math.cos(rad)
-            py = self.y - self.radius * math.sin(rad)
+            px = center + self.radius * math.cos(rad)
+            py = center - self.radius * math.sin(rad)
             points.append((int(px), int(py)))
-        points.append((int(self.x), int(self.y)))
+        points.append((center, center))
         
         if len(points) > 2:
-            pygame.draw.polygon(screen, color, points)
+            pygame.draw.polygon(surface, color, points)
         
         # Draw eye
         eye_offset_x = self.radius * 0.3
         eye_offset_y = -self.radius * 0.3
-        if self.facing_direction == LEFT:
+        if facing_direction == LEFT:
             eye_offset_x = -eye_offset_x
-        elif self.facing_direction == UP:
-            eye_offset_x = self.radius * 0.3 if self.facing_direction != LEFT else -self.radius * 0.3
+        elif facing_direction == UP:
             eye_offset_y = -self.radius * 0.1
-        elif self.facing_direction == DOWN:
+        elif facing_direction == DOWN:
             eye_offset_y = -self.radius * 0.5
         
-        eye_x = int(self.x + eye_offset_x)
-        eye_y = int(self.y + eye_offset_y)
-        pygame.draw.circle(screen, (0, 0, 0), (eye_x, eye_y), 3)
+        eye_x = int(center + eye_offset_x)
+        eye_y = int(center + eye_offset_y)
+        pygame.draw.circle(surface, (0, 0, 0), (eye_x, eye_y), 3)
+        
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface
+    
+    def _render_mini_heart(self):
+        """Render the small heart that orbits Pac-Man while powered up."""
+        surface = pygame.Surface((MINI_HEART_SIZE + 1, MINI_HEART_SIZE + 1),
+                                 pygame.SRCALPHA)
+        half = MINI_HEART_SIZE // 2
+        self._draw_mini_heart(surface, half, half, MINI_HEART_SIZE)
+        return surface
+    
+    def _get_orbit_offsets(self):
+        """Get (cached) mini-heart offsets for each step around the orbit."""
+        offsets = _orbit_offsets.get(self.radius)
+        if offsets is None:
+            orbit = self.radius + 5
+            half = MINI_HEART_SIZE // 2
+            offsets = []
+            for step in range(ORBIT_STEPS):
+                angle = step * 2 * math.pi / ORBIT_STEPS
+                offsets.append((int(orbit * math.cos(angle)) - half,
+                                int(orbit * math.sin(angle)) - half))
+            _orbit_offsets[self.radius] = offsets
+        return offsets
+    
+    def draw(self, screen, current_time):
+        """Draw Pac-Man on the screen using pre-rendered frames."""
+        # Frames are rendered at Pac-Man's size, so a new TILE_SIZE
+        # throws the old ones away
+        _atlas.set_scale(self.radius)
+        
+        color = self._get_color(current_time)
+        key = (self.facing_direction, self.mouth_angle, color)
+        frame = _atlas.get(key, lambda: self._render_frame(*key))
+        center = self.radius + 1
+        x, y = int(self.draw_x), int(self.draw_y)
+        screen.blit(frame, (x - center, y - center))
         
         # Draw power-up indicator if active
         if self.powered_up:
             # Draw small hearts around Pac-Man
+            heart = _atlas.get("mini_heart", self._render_mini_heart)
+            offsets = self._get_orbit_offsets()
+            step = int(current_time / 500 * ORBIT_STEPS / (2 * math.pi))
             for i in range(3):
-                angle = pygame.time.get_ticks() / 500 + i * (2 * math.pi / 3)
-                hx = self.x + (self.radius + 5) * math.cos(angle)
-                hy = self.y + (self.radius + 5) * math.sin(angle)
-                self._draw_mini_heart(screen, int(hx), int(hy), 4)
+                dx, dy = offsets[(step + i * ORBIT_STEPS // 3) % ORBIT_STEPS]
+                screen.blit(heart, (x + dx, y + dy))
     
     def _draw_mini_heart(self, screen, x, y, size):
         """Draw a small heart at the given position."""
@@ -6,6 +6,7 @@ When collected, Pac-Man shoots hearts for a limited duration.
 import pygame
 import random
 import math
+from collision import entities_overlap
 from config import (
     TILE_SIZE, MAZE_OFFSET_X, MAZE_OFFSET_Y,
     ROSE_SPAWN_INTERVAL
@@ -15,7 +16,8 @@ from config import (
 class Rose:
     """Rose power-up that enables heart shooting."""
     
-    def __init__(self):
+    def __init__(self, rng=random):
+        self.rng = rng  # The game's random.Random, for reproducible runs
         self.x = 0
         self.y = 0
         self.grid_x = 0
@@ -23,22 +25,19 @@ class Rose:
         self.active = False
         self.last_spawn_time = 0
         self.radius = TILE_SIZE // 2 - 2
+        self.left = 0  # Collision box, like get_rect()
+        self.top = 0
+        self.box_size = self.radius * 2
         self.animation_offset = 0
     
     def spawn(self, maze, current_time):
-        """Spawn rose at a random empty position."""
-        empty_positions = maze.get_empty_positions()
-        
-        # Filter out positions too close to ghost house
-        valid_positions = [
-            (x, y) for x, y in empty_positions
-            if not (11 <= x <= 16 and 12 <= y <= 16)  # Avoid ghost house area
-        ]
-        
-        if valid_positions:
-            self.grid_x, self.grid_y = random.choice(valid_positions)
+        """Spawn rose at a random empty position (away from the ghost house)."""
+        if maze.spawn_positions:
+            self.grid_x, self.grid_y = self.rng.choice(maze.spawn_positions)
             self.x = MAZE_OFFSET_X + self.grid_x * TILE_SIZE + TILE_SIZE // 2
             self.y = MAZE_OFFSET_Y + self.grid_y * TILE_SIZE + TILE_SIZE // 2
+            self.left = self.x - self.radius
+            self.top = self.y - self.radius
             self.active = True
             self.last_spawn_time = current_time
     
@@ -62,13 +61,8 @@ class Rose:
         return False
     
     def get_rect(self):
-        """Get rose's collision rectangle."""
-        return pygame.Rect(
-            self.x - self.radius,
-            self.y - self.radius,
-            self.radius * 2,
-            self.radius * 2
-        )
+        """Get rose's collision rectangle (a new Rect)."""
+        return pygame.Rect(self.left, self.top, self.box_size, self.box_size)
     
     def collides_with(self, other_rect):
         """Check collision with another rectangle."""
@@ -76,7 +70,19 @@ class Rose:
             return False
         return self.get_rect().colliderect(other_rect)
     
-    def draw(self, screen):
+    def collides_with_pacman(self, pacman):
+        """Check collision with Pac-Man (without building Rects)."""
+        return self.active and entities_overlap(self, pacman)
+    
+    def get_draw_rect(self):
+        """Get the screen area covered by the rose (stem and sparkle)."""
+        if not self.active:
+            return None
+        x = int(self.x)
+        y = int(self.y + self.animation_offset)
+        return pygame.Rect(x - 10, y - 11, 21, 24)
+    
+    def draw(self, screen, current_time):
         """Draw the rose on the screen."""
         if not self.active:
             return
@@ -121,7 +127,7 @@ class Rose:
         pygame.draw.circle(screen, petal_colors[3], (x, y - 2), 3)
         
         # Add sparkle effect
-        sparkle_offset = (pygame.time.get_ticks() // 100) % 8
+        sparkle_offset = (current_time // 100) % 8
         if sparkle_offset < 4:
             sparkle_x = x + 6 - sparkle_offset
             sparkle_y = y - 8 + sparkle_offset
@@ -132,13 +138,14 @@ class Rose:
 class RoseManager:
     """Manages rose spawning and collection."""
     
-    def __init__(self):
-        self.rose = Rose()
+    def __init__(self, rng=random):
+        self.rng = rng
+        self.rose = Rose(rng)
         self.spawn_interval = ROSE_SPAWN_INTERVAL
     
     def reset(self):
         """Reset the rose manager."""
-        self.rose = Rose()
+        self.rose = Rose(self.rng)
     
     def update(self, maze, pacman, current_time):
         """Update rose state and check for collection."""
@@ -149,12 +156,16 @@ class RoseManager:
         self.rose.update(current_time)
         
         # Check for collection
-        if self.rose.active and self.rose.collides_with(pacman.get_rect()):
+        if self.rose.collides_with_pacman(pacman):
             self.rose.collect()
             return True  # Rose was collected
         
         return False
     
-    def draw(self, screen):
+    def get_draw_rect(self):
+        """Get the screen area covered by the rose."""
+        return self.rose.get_draw_rect()
+    
+    def draw(self, screen, current_time):
         """Draw the rose."""
-        self.rose.draw(screen)
+        self.rose.draw(screen, current_time)
@@ -0,0 +1,152 @@
+"""
+Frame profiler for Valentine's Pac-Man game.
+Times each phase of every frame (events, update, drawing, display,
+frame-rate wait) into a ring buffer, for an on-screen summary (F3) and
+export as CSV or Chrome trace-event JSON (chrome://tracing, Perfetto).
+"""
+
+import csv
+import json
+import time
+from array import array
+
+# Phases, in the order a frame normally runs them; "draw" is drawing
+# work outside the maze/sprite/HUD parts (clearing, overlays)
+PHASES = [
+    "events", "update", "draw", "draw_maze", "draw_sprites", "draw_hud",
+    "present", "wait",
+]
+HISTORY_FRAMES = 600  # Frames kept (10s at 60 FPS)
+EVENTS_PER_FRAME = 16  # Trace events kept per frame, on average
+PERCENTILES = [50, 95, 99]
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank q-th percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-q * len(sorted_values) // 100))  # Ceiling
+    return sorted_values[rank - 1]
+
+
+class FrameProfiler:
+    """
+    Per-phase frame timings for the last HISTORY_FRAMES frames.
+    
+    Call begin_frame() at the top of the main loop, mark(phase) as each
+    phase finishes (the time since the previous mark is charged to it)
+    and end_frame() at the bottom. Times are in milliseconds.
+    """
+    
+    def __init__(self, capacity=HISTORY_FRAMES):
+        self.capacity = capacity
+        self._phase_index = {phase: i for i, phase in enumerate(PHASES)}
+        self._origin = time.perf_counter()
+        
+        # Frame ring: start time, total and per-phase totals of each frame
+        self._frame_start = array("d", [0.0]) * capacity
+        self._frame_total = array("d", [0.0]) * capacity
+        self._phase_totals = [array("d", [0.0]) * capacity for _ in PHASES]
+        self.frame_count = 0  # Frames recorded (the ring holds the latest)
+        
+        # Event ring for traces: phase, start and duration of every mark
+        self._event_capacity = capacity * EVENTS_PER_FRAME
+        self._event_phase = array("B", [0]) * self._event_capacity
+        self._event_start = array("d", [0.0]) * self._event_capacity
+        self._event_duration = array("d", [0.0]) * self._event_capacity
+        self._event_count = 0
+        
+        self._current = [0.0] * len(PHASES)
+        self._start = None  # Start of the frame in progress
+        self._last = None  # Time of the last mark
+    
+    def begin_frame(self):
+        """Start timing a frame."""
+        self._start = self._last = time.perf_counter()
+        current = self._current
+        for i in range(len(current)):
+            current[i] = 0.0
+    
+    def mark(self, phase):
+        """Charge the time since the last mark to phase."""
+        if self._start is None:
+            return  # Turned on mid-frame; wait for the next one
+        now = time.perf_counter()
+        duration = (now - self._last) * 1000
+        index = self._phase_index[phase]
+        self._current[index] += duration
+        
+        slot = self._event_count % self._event_capacity
+        self._event_phase[slot] = index
+        self._event_start[slot] = (self._last - self._origin) * 1000
+        self._event_duration[slot] = duration
+        self._event_count += 1
+        self._last = now
+    
+    def end_frame(self):
+        """Finish the frame and store its timings."""
+        if self._start is None:
+            return
+        slot = self.frame_count % self.capacity
+        self._frame_start[slot] = (self._start - self._origin) * 1000
+        self._frame_total[slot] = (self._last - self._start) * 1000
+        for totals, duration in zip(self._phase_totals, self._current):
+            totals[slot] = duration
+        self.frame_count += 1
+        self._start = None
+    
+    def _frame_slots(self):
+        """Ring slots of the stored frames, oldest first."""
+        count = min(self.frame_count, self.capacity)
+        first = self.frame_count - count
+        return [i % self.capacity for i in range(first, self.frame_count)]
+    
+    def percentiles(self, phase=None, qs=PERCENTILES):
+        """Percentiles of a phase's time per frame (whole frames if None)."""
+        if phase is None:
+            values = self._frame_total
+        else:
+            values = self._phase_totals[self._phase_index[phase]]
+        ordered = sorted(values[i] for i in self._frame_slots())
+        return [percentile(ordered, q) for q in qs]
+    
+    def summary_rows(self):
+        """Table (rows of strings) of frame and phase percentiles."""
+        rows = [["ms"] + [f"p{q}" for q in PERCENTILES]]
+        for label, phase in [("frame", None)] + [(p, p) for p in PHASES]:
+            rows.append([label] + [f"{value:.2f}"
+                                   for value in self.percentiles(phase)])
+        return rows
+    
+    def save_csv(self, path):
+        """Write one row per stored frame: start, total and each phase."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "start_ms", "total_ms"] + PHASES)
+            first = self.frame_count - min(self.frame_count, self.capacity)
+            for frame, i in enumerate(self._frame_slots(), first):
+                writer.writerow(
+                    [frame, f"{self._frame_start[i]:.3f}",
+                     f"{self._frame_total[i]:.3f}"] +
+                    [f"{totals[i]:.3f}" for totals in self._phase_totals])
+    
+    def save_chrome_trace(self, path):
+        """Write stored frames and phases as Chrome trace events."""
+        events = []
+        for i in self._frame_slots():
+            events.append({
+                "name": "frame", "ph": "X", "pid": 1, "tid": 1,
+                "ts": self._frame_start[i] * 1000,
+                "dur": self._frame_total[i] * 1000,
+            })
+        count = min(self._event_count, self._event_capacity)
+        for n in range(self._event_count - count, self._event_count):
+            i = n % self._event_capacity
+            events.append({
+                "name": PHASES[self._event_phase[i]], "ph": "X",
+                "pid": 1, "tid": 1,
+                "ts": self._event_start[i] * 1000,
+                "dur": self._event_duration[i] * 1000,
+            })
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
@@ -5,68 +5,132 @@ Hearts are shot when Pac-Man is powered up by the rose.
 
 import pygame
 import math
-from config import (
-    TILE_SIZE, MAZE_OFFSET_X, MAZE_OFFSET_Y,
-    HEART_SPEED, HEART_COLOR, HEART_FIRE_RATE
+from config import HEART_SPEED, HEART_COLOR, HEART_FIRE_RATE, MAX_HEARTS
+from collision import SpatialHash, entities_overlap
+from subpixel import (
+    SUBPIXEL, TILE, ORIGIN_X, ORIGIN_Y, to_subpixels, to_pixels,
+    whole_pixels, grid_x_of, grid_y_of
 )
+from timestep import interpolate
 
 
 class Heart:
-    """Heart projectile that eliminates ghosts."""
+    """Heart projectile that eliminates ghosts (reused through launch)."""
     
-    def __init__(self, x, y, direction):
-        self.x = x
-        self.y = y
+    __slots__ = (
+        "sub_x", "sub_y", "grid_x", "grid_y", "left", "top", "prev_x",
+        "prev_y", "draw_x", "draw_y", "direction", "active", "trail_x",
+        "trail_y", "trail_head", "trail_length",
+    )
+    
+    speed = to_subpixels(HEART_SPEED)  # Sub-pixel steps per tick
+    size = 8
+    box_size = size  # Collision box, like get_rect()
+    max_trail_length = 5
+    
+    def __init__(self):
+        # Trail effect positions, a ring buffer: trail_head is the next slot
+        # to write and the oldest position is trail_length slots back
+        self.trail_x = [0] * self.max_trail_length
+        self.trail_y = [0] * self.max_trail_length
+        self.launch(0, 0, (0, 0))
+        self.active = False
+    
+    @property
+    def x(self):
+        """Pixel x position of the heart's centre."""
+        return to_pixels(self.sub_x)
+    
+    @property
+    def y(self):
+        """Pixel y position of the heart's centre."""
+        return to_pixels(self.sub_y)
+    
+    def launch(self, sub_x, sub_y, direction):
+        """Start the heart off from (sub_x, sub_y), in sub-pixel steps."""
+        self._move_to(sub_x, sub_y)
+        self.prev_x, self.prev_y = self.x, self.y  # Position at the last tick
+        self.draw_x, self.draw_y = self.prev_x, self.prev_y  # For drawing
         self.direction = direction
-        self.speed = HEART_SPEED
-        self.size = 8
         self.active = True
-        self.trail = []  # Trail effect positions
-        self.max_trail_length = 5
+        self.trail_head = 0
+        self.trail_length = 0
+    
+    def _move_to(self, sub_x, sub_y):
+        """Set the position (in sub-pixel steps), tile and collision box."""
+        self.sub_x = sub_x
+        self.sub_y = sub_y
+        self.grid_x = grid_x_of(sub_x)
+        self.grid_y = grid_y_of(sub_y)
+        offset = self.size // 2 * SUBPIXEL
+        self.left = whole_pixels(sub_x - offset)
+        self.top = whole_pixels(sub_y - offset)
+    
+    def get_trail(self):
+        """Get the trail positions in pixels, oldest first."""
+        start = self.trail_head - self.trail_length
+        return [(to_pixels(self.trail_x[i]), to_pixels(self.trail_y[i]))
+                for i in range(start, self.trail_head)]  # Negative i wraps
     
     def update(self, maze):
         """Update heart position."""
         if not self.active:
             return
         
-        # Add current position to trail
-        self.trail.append((self.x, self.y))
-        if len(self.trail) > self.max_trail_length:
-            self.trail.pop(0)
+        self.prev_x, self.prev_y = self.x, self.y
+        
+        # Add current position to trail (overwriting the oldest when full)
+        self.trail_x[self.trail_head] = self.sub_x
+        self.trail_y[self.trail_head] = self.sub_y
+        self.trail_head = (self.trail_head + 1) % self.max_trail_length
+        if self.trail_length < self.max_trail_length:
+            self.trail_length += 1
         
         # Move heart
-        self.x += self.direction[0] * self.speed
-        self.y += self.direction[1] * self.speed
+        self._move_to(self.sub_x + self.direction[0] * self.speed,
+                      self.sub_y + self.direction[1] * self.speed)
         
         # Check wall collision
-        grid_x = int((self.x - MAZE_OFFSET_X) // TILE_SIZE)
-        grid_y = int((self.y - MAZE_OFFSET_Y) // TILE_SIZE)
-        
-        if maze.is_wall(grid_x, grid_y):
+        if maze.is_wall(self.grid_x, self.grid_y):
             self.active = False
             return
         
         # Check bounds
-        if (self.x < MAZE_OFFSET_X or 
-            self.x > MAZE_OFFSET_X + maze.width * TILE_SIZE or
-            self.y < MAZE_OFFSET_Y or 
-            self.y > MAZE_OFFSET_Y + maze.height * TILE_SIZE):
+        if (self.sub_x < ORIGIN_X or 
+            self.sub_x > ORIGIN_X + maze.width * TILE or
+            self.sub_y < ORIGIN_Y or 
+            self.sub_y > ORIGIN_Y + maze.height * TILE):
             self.active = False
     
     def get_rect(self):
-        """Get heart's collision rectangle."""
-        return pygame.Rect(
-            self.x - self.size // 2,
-            self.y - self.size // 2,
-            self.size,
-            self.size
-        )
+        """Get heart's collision rectangle (a new Rect)."""
+        return pygame.Rect(self.left, self.top, self.box_size, self.box_size)
     
     def collides_with_ghost(self, ghost):
         """Check collision with a ghost."""
         if not self.active or not ghost.alive:
             return False
-        return self.get_rect().colliderect(ghost.get_rect())
+        return entities_overlap(self, ghost)
+    
+    def interpolate(self, alpha):
+        """Set the position to draw at, alpha of the way through this tick."""
+        self.draw_x = interpolate(self.prev_x, self.x, alpha)
+        self.draw_y = interpolate(self.prev_y, self.y, alpha)
+    
+    def get_draw_rect(self):
+        """Get the screen area covered by the heart and its trail."""
+        if not self.active:
+            return None
+        extent = self.size
+        rect = pygame.Rect(int(self.draw_x) - extent, int(self.draw_y) - extent,
+                           extent * 2 + 1, extent * 2 + 1)
+        if self.trail_length:
+            rect.unionall_ip([
+                pygame.Rect(int(tx) - extent, int(ty) - extent,
+                            extent * 2 + 1, extent * 2 + 1)
+                for tx, ty in self.get_trail()
+            ])
+        return rect
     
     def draw(self, screen):
         """Draw the heart on the screen."""
@@ -74,8 +138,8 @@ class Heart:
             return
         
         # Draw trail
-        for i, (tx, ty) in enumerate(self.trail):
-            alpha = (i + 1) / len(self.trail)
+        for i, (tx, ty) in enumerate(self.get_trail()):
+            alpha = (i + 1) / self.trail_length
             trail_size = int(self.size * alpha * 0.6)
             trail_color = (
                 int(255 * alpha),
@@ -86,13 +150,13 @@ class Heart:
                                    trail_size, trail_color)
         
         # Draw main heart
-        self._draw_heart_shape(screen, int(self.x), int(self.y), 
+        self._draw_heart_shape(screen, int(self.draw_x), int(self.draw_y), 
                               self.size, HEART_COLOR)
         
         # Add glow effect
         glow_color = (255, 200, 220)
         pygame.draw.circle(screen, glow_color, 
-                          (int(self.x), int(self.y - 1)), 2)
+                          (int(self.draw_x), int(self.draw_y - 1)), 2)
     
     def _draw_heart_shape(self, screen, x, y, size, color):
         """Draw a heart shape at the given position."""
@@ -116,14 +180,27 @@ class Heart:
 class HeartManager:
     """Manages heart projectile creation and updates."""
     
-    def __init__(self):
-        self.hearts = []
+    def __init__(self, capacity=MAX_HEARTS):
+        # A fixed pool of hearts: the first count are in flight, in the
+        # order they were fired, and the rest are ready to be launched
+        self._pool = [Heart() for _ in range(capacity)]
+        self.count = 0
         self.last_fire_time = 0
         self.fire_rate = HEART_FIRE_RATE
+        # Live ghosts by tile, rebuilt each update
+        self._ghost_grid = SpatialHash(cell_size=1)
+        self._ghosts_killed = []  # Reused for update's result
+    
+    @property
+    def hearts(self):
+        """The hearts in flight, oldest first (a new list)."""
+        return self._pool[:self.count]
     
     def reset(self):
         """Reset all hearts."""
-        self.hearts = []
+        for heart in self._pool:
+            heart.active = False
+        self.count = 0
         self.last_fire_time = 0
     
     def fire(self, pacman, current_time):
@@ -138,33 +215,67 @@ class HeartManager:
         if pacman.facing_direction == (0, 0):
             return
         
-        # Create new heart
-        heart = Heart(pacman.x, pacman.y, pacman.facing_direction)
-        self.hearts.append(heart)
+        # Launch the next free heart (none while they are all in flight)
+        if self.count == len(self._pool):
+            return
+        self._pool[self.count].launch(pacman.sub_x, pacman.sub_y,
+                                      pacman.facing_direction)
+        self.count += 1
         self.last_fire_time = current_time
     
     def update(self, maze, ghosts, current_time):
-        """Update all hearts and check collisions with ghosts."""
-        ghosts_killed = []
+        """
+        Update all hearts and check collisions with ghosts.
+        
+        Returns the ghosts killed, in a list that is reused next update.
+        """
+        ghosts_killed = self._ghosts_killed
+        ghosts_killed.clear()
+        if not self.count:
+            return ghosts_killed
+        
+        # Ghosts stay put while hearts move, so bucket them once; a heart
+        # can only reach ghosts in its own or the neighbouring tiles
+        grid = self._ghost_grid
+        grid.clear()
+        for i, ghost in enumerate(ghosts):
+            if ghost.alive:
+                grid.insert(i, ghost.grid_x, ghost.grid_y)
         
-        for heart in self.hearts[:]:  # Iterate over copy
+        # Hearts still flying are packed to the front in firing order, and
+        # spent ones swapped behind them, ready for reuse
+        pool = self._pool
+        flying = 0
+        for i in range(self.count):
+            heart = pool[i]
             heart.update(maze)
             
-            # Check ghost collisions
-            for ghost in ghosts:
+            # Check ghost collisions (first ghost hit, in ghost order)
+            for j in grid.query(heart.grid_x, heart.grid_y):
+                ghost = ghosts[j]
                 if heart.collides_with_ghost(ghost):
                     ghost.kill(current_time)
                     ghosts_killed.append(ghost)
                     heart.active = False
                     break
             
-            # Remove inactive hearts
-            if not heart.active:
-                self.hearts.remove(heart)
+            if heart.active:
+                pool[i], pool[flying] = pool[flying], heart
+                flying += 1
+        self.count = flying
         
         return ghosts_killed
     
+    def interpolate(self, alpha):
+        """Set where to draw each heart, alpha of the way through this tick."""
+        for i in range(self.count):
+            self._pool[i].interpolate(alpha)
+    
+    def get_draw_rects(self):
+        """Get the screen areas covered by all hearts."""
+        return [self._pool[i].get_draw_rect() for i in range(self.count)]
+    
     def draw(self, screen):
         """Draw all hearts."""
-        for heart in self.hearts:
-            heart.draw(screen)
+        for i in range(self.count):
+            self._pool[i].draw(screen)
@@ -0,0 +1,151 @@
+"""
+Input recording and replay for Valentine's Pac-Man game.
+A recording is the game's seed plus Pac-Man's direction changes tagged
+with tick numbers, and state hashes to check a re-simulation against.
+
+Usage:
+    python replay.py recording.json
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+
+from config import GHOST_COUNT, STATE_PLAYING
+from game import Game
+
+CHECKPOINT_INTERVAL = 600  # Ticks between state hashes (10s of play)
+
+
+def hash_game_state(game):
+    """Hash everything that decides how the game plays out from here."""
+    pacman = game.pacman
+    rose = game.rose_manager.rose
+    state = (
+        game.tick, game.state, game.score, game.lives, game.death_animation,
+        game.death_time, game.ghosts_killed,
+        (pacman.sub_x, pacman.sub_y, pacman.direction, pacman.next_direction,
+         pacman.facing_direction, pacman.powered_up,
+         pacman.powerup_start_time),
+        [(ghost.sub_x, ghost.sub_y, ghost.direction, ghost.alive,
+          ghost.respawn_time, ghost.in_ghost_house, ghost.exit_timer)
+         for ghost in game.ghosts],
+        [(heart.sub_x, heart.sub_y, heart.direction)
+         for heart in game.heart_manager.hearts],
+        game.heart_manager.last_fire_time,
+        (rose.active, rose.grid_x, rose.grid_y, rose.last_spawn_time),
+        bytes(game.maze.dots),
+    )
+    return hashlib.sha256(repr(state).encode()).hexdigest()
+
+
+class InputRecorder:
+    """Records one game's steering, plus state hashes, for replay."""
+    
+    def __init__(self, checkpoint_interval=CHECKPOINT_INTERVAL):
+        self.checkpoint_interval = checkpoint_interval
+        self.start(None)
+    
+    def start(self, seed, ghost_count=GHOST_COUNT):
+        """Begin a new recording of a game started with seed."""
+        self.seed = seed
+        self.ghost_count = ghost_count
+        self.inputs = []  # [tick, dx, dy] whenever the direction changes
+        self.checkpoints = []  # [tick, state hash]
+        self.final = None
+    
+    def record(self, game, previous_direction):
+        """Called by the game each tick, once input has been applied."""
+        direction = game.pacman.next_direction
+        if direction != previous_direction:
+            self.inputs.append([game.tick, direction[0], direction[1]])
+        if game.tick % self.checkpoint_interval == 0:
+            self.checkpoints.append([game.tick, hash_game_state(game)])
+    
+    def finish(self, game):
+        """Note where the game has got to, to check replays against."""
+        self.final = {
+            "tick": game.tick,
+            "state": game.state,
+            "score": game.score,
+            "hash": hash_game_state(game),
+        }
+    
+    def to_dict(self):
+        """The recording as plain JSON-serialisable data."""
+        return {
+            "seed": self.seed,
+            "ghosts": self.ghost_count,
+            "checkpoint_interval": self.checkpoint_interval,
+            "inputs": self.inputs,
+            "checkpoints": self.checkpoints,
+            "final": self.final,
+        }
+    
+    def save(self, path):
+        """Write the recording to a JSON file."""
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+
+
+def load_recording(path):
+    """Read a recording saved by InputRecorder.save."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def replay_policy(inputs):
+    """Make a policy that steers Pac-Man as recorded."""
+    steering = {tick: (dx, dy) for tick, dx, dy in inputs}
+    
+    def policy(game):
+        return steering.get(game.tick)
+    
+    return policy
+
+
+def replay(recording):
+    """
+    Re-simulate a recording headlessly and check it against its hashes.
+    
+    Returns (ok, message), where message names the first divergence.
+    """
+    final = recording["final"]
+    game = Game(None, policy=replay_policy(recording["inputs"]),
+                ghost_count=recording.get("ghosts", GHOST_COUNT))
+    game.recorder = InputRecorder(recording["checkpoint_interval"])
+    game.reset_game(recording["seed"])
+    while game.state == STATE_PLAYING and game.tick < final["tick"]:
+        game.update()
+    game.recorder.finish(game)
+    
+    for expected, actual in zip(recording["checkpoints"],
+                                game.recorder.checkpoints):
+        if expected != actual:
+            return False, f"state diverged by tick {expected[0]}"
+    result = game.recorder.final
+    for key in ["tick", "state", "score", "hash"]:
+        if result[key] != final[key]:
+            return False, (f"final {key} differs: recorded {final[key]!r}, "
+                           f"replayed {result[key]!r}")
+    return True, f"replay matches at tick {result['tick']}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("recording", help="JSON file saved by InputRecorder")
+    args = parser.parse_args()
+    
+    recording = load_recording(args.recording)
+    start = time.perf_counter()
+    ok, message = replay(recording)
+    elapsed = time.perf_counter() - start
+    print(f"{message} ({recording['final']['tick']} ticks "
+          f"in {elapsed:.2f}s)")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Parallel rollout runner for Valentine's Pac-Man game.
+Plays many seeded headless games across a process pool and aggregates
+their results, e.g. to assess ghost difficulty.
+
+Usage:
+    python rollout.py [--episodes N] [--workers W] [--max-ticks T]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from config import TICK_RATE, STARTING_LIVES
+from game import Game
+from headless import random_policy, run_headless
+
+METRICS = ["score", "lives_lost", "ticks", "ghosts_killed"]
+
+# Each worker process builds one game (and so one maze) and reuses it
+_worker_game = None
+
+
+def _init_worker():
+    """Create the worker's game once, when the process starts."""
+    global _worker_game
+    _worker_game = Game(None)
+
+
+def play_episode(game, seed, max_ticks):
+    """Play one seeded game to the end (or max_ticks) and report on it."""
+    game.policy = random_policy(random.Random(seed))
+    run_headless(game, max_ticks, seed)
+    return {
+        "seed": seed,
+        "score": game.score,
+        "lives_lost": STARTING_LIVES - game.lives,
+        "ticks": game.tick,
+        "ghosts_killed": game.ghosts_killed,
+        "state": game.state,
+    }
+
+
+def _play_chunk(seeds, max_ticks):
+    """Worker task: play a chunk of episodes with the worker's game."""
+    return [play_episode(_worker_game, seed, max_ticks) for seed in seeds]
+
+
+def run_rollouts(seeds, max_ticks, workers=None, chunk_size=16):
+    """
+    Play one episode per seed across a process pool.
+    
+    Yields each episode's result as soon as its chunk finishes (so not in
+    seed order).
+    """
+    seeds = list(seeds)
+    chunks = [seeds[i:i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_worker) as executor:
+        futures = [executor.submit(_play_chunk, chunk, max_ticks)
+                   for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def summarize(results):
+    """Aggregate episode results into per-metric summary statistics."""
+    summary = {"episodes": len(results)}
+    for metric in METRICS:
+        values = [result[metric] for result in results]
+        summary[metric] = {
+            "mean": statistics.fmean(values),
+            "stdev": statistics.pstdev(values),
+            "min": min(values),
+            "median": statistics.median(values),
+            "max": max(values),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--episodes", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--max-ticks", type=int, default=TICK_RATE * 600)
+    parser.add_argument("--first-seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    results = []
+    seeds = range(args.first_seed, args.first_seed + args.episodes)
+    for result in run_rollouts(seeds, args.max_ticks, args.workers):
+        results.append(result)
+        if len(results) % 100 == 0:
+            print(f"{len(results)}/{args.episodes} episodes done")
+    elapsed = time.perf_counter() - start
+    
+    summary = summarize(results)
+    total_ticks = sum(result["ticks"] for result in results)
+    print(f"{summary['episodes']} episodes, {total_ticks} ticks in "
+          f"{elapsed:.1f}s on {args.workers} workers "
+          f"({total_ticks / elapsed:.0f} ticks/s)")
+    for metric in METRICS:
+        stats = summary[metric]
+        print(f"{metric:>14}: mean {stats['mean']:.1f} +- {stats['stdev']:.1f}"
+              f"  min {stats['min']}  median {stats['median']}"
+              f"  max {stats['max']}")
+
+
+if __name__ == "__main__":
+    main()
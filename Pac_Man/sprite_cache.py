@@ -0,0 +1,44 @@
+"""
+Sprite cache for Valentine's Pac-Man game.
+Keeps pre-rendered surfaces so sprites are drawn with a single blit.
+"""
+
+from collections import OrderedDict
+
+
+class SpriteCache:
+    """Memory-bounded cache of pre-rendered surfaces (least recently used out)."""
+    
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.scale = None  # Size the cached sprites were rendered for
+        self._surfaces = OrderedDict()
+    
+    def __len__(self):
+        return len(self._surfaces)
+    
+    def __contains__(self, key):
+        return key in self._surfaces
+    
+    def clear(self):
+        """Drop every cached surface."""
+        self._surfaces.clear()
+    
+    def set_scale(self, scale):
+        """Invalidate the cache when the sprite size it was built for changes."""
+        if scale != self.scale:
+            self.clear()
+            self.scale = scale
+    
+    def get(self, key, render):
+        """Get the surface for key, calling render() to build it on a miss."""
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+        
+        surface = render()
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
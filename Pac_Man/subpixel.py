@@ -0,0 +1,51 @@
+"""
+Fixed-point positions for Valentine's Pac-Man game.
+Movers keep their positions as integers counting 1/SUBPIXEL pixel steps,
+so fractional speeds add up exactly and every run reproduces bit for bit.
+"""
+
+from config import SUBPIXEL, TILE_SIZE, MAZE_OFFSET_X, MAZE_OFFSET_Y
+
+# The maze grid, measured in sub-pixel steps
+TILE = TILE_SIZE * SUBPIXEL
+HALF_TILE = TILE_SIZE // 2 * SUBPIXEL
+ORIGIN_X = MAZE_OFFSET_X * SUBPIXEL
+ORIGIN_Y = MAZE_OFFSET_Y * SUBPIXEL
+
+
+def to_subpixels(pixels):
+    """Convert a pixel distance or speed to sub-pixel steps."""
+    steps = round(pixels * SUBPIXEL)
+    if abs(steps - pixels * SUBPIXEL) > 1e-6:
+        raise ValueError(f"{pixels} is not a whole number of sub-pixels")
+    return steps
+
+
+def to_pixels(steps):
+    """Convert sub-pixel steps back to (fractional) pixels."""
+    return steps / SUBPIXEL
+
+
+def whole_pixels(steps):
+    """Convert sub-pixel steps to whole pixels, truncating like pygame.Rect."""
+    return int(steps / SUBPIXEL)
+
+
+def tile_center_x(grid_x):
+    """Get the x position of a column's centre, in sub-pixel steps."""
+    return ORIGIN_X + grid_x * TILE + HALF_TILE
+
+
+def tile_center_y(grid_y):
+    """Get the y position of a row's centre, in sub-pixel steps."""
+    return ORIGIN_Y + grid_y * TILE + HALF_TILE
+
+
+def grid_x_of(x):
+    """Get the column containing x (in sub-pixel steps)."""
+    return (x - ORIGIN_X) // TILE
+
+
+def grid_y_of(y):
+    """Get the row containing y (in sub-pixel steps)."""
+    return (y - ORIGIN_Y) // TILE
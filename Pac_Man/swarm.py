@@ -0,0 +1,165 @@
+"""
+Ghost swarm stress mode for Valentine's Pac-Man game.
+Finds the most ghosts (mixed Blinky/Pinky/Inky/Clyde, see create_ghosts)
+the game can run while holding its target frame rate.
+
+Usage:
+    python swarm.py [--start 16] [--step 16] [--max 2048] [--seed 0]
+
+To play with a swarm, run python main.py --ghosts 200 ([ and ] change
+the count in game); the window title shows the same counter.
+"""
+
+import argparse
+import os
+import random
+import time
+
+# No window needed (must be set before pygame is imported)
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from config import FPS, SCREEN_WIDTH, SCREEN_HEIGHT, STATE_PLAYING
+from game import Game
+from headless import random_policy
+
+SUSTAIN_FRAMES = FPS  # Frames a ghost count must hold the frame rate for
+FRAME_TOLERANCE = 0.05  # Slack over the frame budget (timer granularity)
+SCATTER_DISTANCE = 10  # Tiles from Pac-Man that timed ghosts start at least
+
+
+class SwarmCounter:
+    """
+    Tracks the largest ghost count that has held the target frame rate.
+    
+    Feed it every frame's time; each run of window frames with the same
+    number of ghosts whose average time fits the frame budget counts.
+    """
+    
+    def __init__(self, fps=FPS, window=SUSTAIN_FRAMES):
+        self.budget_ms = 1000 / fps * (1 + FRAME_TOLERANCE)
+        self.window = window
+        self.max_sustained = 0  # Most ghosts seen holding the frame rate
+        self.last_result = None  # (ghost count, average ms) of last window
+        self._ghost_count = None
+        self._frames = 0
+        self._total_ms = 0.0
+    
+    def frame(self, ghost_count, frame_ms):
+        """
+        Note one frame's time with ghost_count ghosts.
+        
+        Returns True when this frame finished a window that held the
+        frame rate, False when it finished one that did not, else None.
+        """
+        if ghost_count != self._ghost_count:
+            self._ghost_count = ghost_count  # Start timing the new count
+            self._frames = 0
+            self._total_ms = 0.0
+        self._frames += 1
+        self._total_ms += frame_ms
+        if self._frames < self.window:
+            return None
+        
+        average = self._total_ms / self._frames
+        self.last_result = (ghost_count, average)
+        self._frames = 0
+        self._total_ms = 0.0
+        if average <= self.budget_ms:
+            self.max_sustained = max(self.max_sustained, ghost_count)
+            return True
+        return False
+
+
+def scatter_ghosts(game, rng, min_distance=SCATTER_DISTANCE):
+    """Put every ghost on a random tile at least min_distance from Pac-Man."""
+    pacman = game.pacman
+    tiles = [(x, y) for x, y in game.maze.spawn_positions
+             if abs(x - pacman.grid_x) + abs(y - pacman.grid_y) >= min_distance]
+    for ghost in game.ghosts:
+        ghost.place(*rng.choice(tiles))
+
+
+def time_frames(game, frames):
+    """Play frames frames (one tick, draw and present each); yield times."""
+    for _ in range(frames):
+        start = time.perf_counter()
+        if game.state != STATE_PLAYING:
+            game.reset_game()
+        game.update()
+        dirty_rects = game.draw()
+        if dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty_rects)
+        yield (time.perf_counter() - start) * 1000
+
+
+def find_max_ghosts(screen, start=16, step=16, max_ghosts=2048, seed=0,
+                    report=None):
+    """
+    Add step ghosts at a time until a frame no longer fits the budget.
+    
+    Frames are timed without waiting for the display, so this measures
+    the work per frame: the count found is what the machine could hold
+    at FPS. The ghosts are timed spread out over the maze, the busiest
+    a swarm gets, rather than queueing to leave the ghost house.
+    report(count, average ms, held), if given, is called for each count
+    tried. Returns the counter.
+    """
+    counter = SwarmCounter()
+    rng = random.Random(seed)
+    game = Game(screen, policy=random_policy(random.Random(seed)),
+                seed=seed, ghost_count=start)
+    game.reset_game()
+    count = start
+    while count <= max_ghosts:
+        if count != len(game.ghosts):
+            game.set_ghost_count(count)
+        
+        # Warm up (sprites, path data), then time one window
+        for _ in time_frames(game, SUSTAIN_FRAMES):
+            pass
+        if game.state != STATE_PLAYING or game.death_animation:
+            game.reset_game()
+        scatter_ghosts(game, rng)
+        for frame_ms in time_frames(game, counter.window):
+            held = counter.frame(count, frame_ms)
+        if report is not None:
+            report(count, counter.last_result[1], held)
+        if not held:
+            break
+        count += step
+    return counter
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--start", type=int, default=16,
+                        help="ghosts to start with")
+    parser.add_argument("--step", type=int, default=16,
+                        help="ghosts added each round")
+    parser.add_argument("--max", type=int, default=2048,
+                        help="most ghosts to try")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed for the game and the random policy")
+    args = parser.parse_args()
+    
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    
+    def report(count, average_ms, held):
+        status = "ok" if held else "too slow"
+        print(f"{count:5d} ghosts: {average_ms:6.2f} ms/frame  {status}")
+    
+    counter = find_max_ghosts(screen, args.start, args.step, args.max,
+                              args.seed, report)
+    print(f"Most ghosts holding {FPS} FPS: {counter.max_sustained} "
+          f"(budget {1000 / FPS:.2f} ms/frame)")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Fixed-timestep helpers for Valentine's Pac-Man game.
+The simulation advances in constant ticks while rendering runs at
+whatever rate the machine manages, interpolating between ticks.
+"""
+
+from config import TILE_SIZE
+
+
+class FixedTimestep:
+    """Accumulates frame time and hands it out as whole simulation ticks."""
+    
+    def __init__(self, tick_rate, max_ticks_per_frame):
+        self.tick_ms = 1000 / tick_rate
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.accumulator = 0.0
+    
+    def advance(self, elapsed_ms):
+        """Add elapsed frame time and return how many ticks to simulate."""
+        self.accumulator += elapsed_ms
+        ticks = int(self.accumulator // self.tick_ms)
+        if ticks > self.max_ticks_per_frame:
+            # Too far behind to catch up: drop the backlog rather than
+            # spending every following frame simulating
+            ticks = self.max_ticks_per_frame
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= ticks * self.tick_ms
+        return ticks
+    
+    @property
+    def alpha(self):
+        """How far (0-1) rendering is between the last tick and the next."""
+        return self.accumulator / self.tick_ms
+
+
+def interpolate(previous, current, alpha):
+    """Blend two positions, jumping straight to current on teleports."""
+    if abs(current - previous) > TILE_SIZE:
+        return current  # Tunnel wrap or respawn
+    return previous + (current - previous) * alpha